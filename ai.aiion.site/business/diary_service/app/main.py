@@ -1,4 +1,5 @@
 from fastapi import FastAPI, APIRouter  # type: ignore
+from fastapi.responses import ORJSONResponse  # type: ignore
 import uvicorn  # type: ignore
 import os
 
@@ -12,7 +13,8 @@ app = FastAPI(
     root_path=root_path,  # API Gateway 경로 설정
     docs_url="/docs",  # Swagger UI 경로 명시
     redoc_url="/redoc",  # ReDoc 경로 명시
-    openapi_url=f"{root_path}/openapi.json" if root_path else "/openapi.json"  # OpenAPI JSON 경로 (절대 경로)
+    openapi_url=f"{root_path}/openapi.json" if root_path else "/openapi.json",  # OpenAPI JSON 경로 (절대 경로)
+    default_response_class=ORJSONResponse  # orjson으로 JSON 직렬화
 )
 
 # API Gateway를 통한 접근 시 서버 URL 설정
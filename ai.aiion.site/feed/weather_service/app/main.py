@@ -1,39 +1,51 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query  # type: ignore
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request  # type: ignore
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html, get_swagger_ui_oauth2_redirect_html  # type: ignore
+from fastapi.responses import ORJSONResponse, Response  # type: ignore
 # CORS는 게이트웨이에서 처리하므로 제거
-from pydantic import BaseModel  # type: ignore
 import uvicorn  # type: ignore
 import os
+import logging
 import requests  # type: ignore
+from urllib3.util.retry import Retry  # type: ignore
 from dotenv import load_dotenv  # type: ignore
-from typing import Optional, Dict  # type: ignore
+from typing import Dict  # type: ignore
 from datetime import datetime, timedelta  # type: ignore
 import csv  # type: ignore
+import orjson  # type: ignore
+import re
+import threading
+import time
 
 # 환경 변수 로드
 load_dotenv()
 
+# 로깅 설정 (lazy % 포맷: 비활성 레벨 메시지는 문자열을 만들지 않음)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s [%(name)s] %(levelname)s %(message)s")
+logger = logging.getLogger("weather_service")
+
 # 기상청 API 키 (중기예보용)
 KMA_API_KEY = os.getenv("KMA_API_KEY", "")
 if not KMA_API_KEY:
-    print("Warning: KMA_API_KEY not set. Mid-term forecast API functionality will be limited.")
+    logger.warning("KMA_API_KEY not set. Mid-term forecast API functionality will be limited.")
 
 # 기상청 API 키 (단기예보용)
 KMA_SHORT_KEY = os.getenv("KMA_SHORT_KEY", "")
 if not KMA_SHORT_KEY:
-    print("Warning: KMA_SHORT_KEY not set. Short-term forecast API functionality will be limited.")
+    logger.warning("KMA_SHORT_KEY not set. Short-term forecast API functionality will be limited.")
 
 # root_path 설정: API Gateway를 통한 접근 시 경로 인식
-import os
 root_path = os.getenv("ROOT_PATH", "")
+OPENAPI_URL = f"{root_path}/openapi.json" if root_path else "/openapi.json"  # OpenAPI JSON 경로 (절대 경로)
 
 app = FastAPI(
     title="Weather Service API",
     version="1.0.0",
     description="기상청 API 서비스",
     root_path=root_path,  # API Gateway 경로 설정
-    docs_url="/docs",  # Swagger UI 경로 명시
-    redoc_url="/redoc",  # ReDoc 경로 명시
-    openapi_url=f"{root_path}/openapi.json" if root_path else "/openapi.json"  # OpenAPI JSON 경로 (절대 경로)
+    openapi_url=None,  # OpenAPI JSON/문서 라우트는 아래에서 직접 등록 (startup 시 미리 직렬화)
+    docs_url=None,
+    redoc_url=None,
+    default_response_class=ORJSONResponse  # orjson으로 JSON 직렬화
 )
 
 # API Gateway를 통한 접근 시 서버 URL 설정
@@ -58,6 +70,31 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+# OpenAPI 스키마는 startup 시 한 번 생성/직렬화해 두고 정적 바이트로 응답
+@app.get(OPENAPI_URL, include_in_schema=False)
+def openapi_json():
+    return Response(content=app.state.openapi_bytes, media_type="application/json")
+
+@app.get("/docs", include_in_schema=False)
+def swagger_ui_html(request: Request):
+    """Swagger UI"""
+    openapi_url = request.scope.get("root_path", "").rstrip("/") + OPENAPI_URL
+    return get_swagger_ui_html(
+        openapi_url=openapi_url,
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url="/docs/oauth2-redirect",
+    )
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+def swagger_ui_redirect():
+    return get_swagger_ui_oauth2_redirect_html()
+
+@app.get("/redoc", include_in_schema=False)
+def redoc_html(request: Request):
+    """ReDoc"""
+    openapi_url = request.scope.get("root_path", "").rstrip("/") + OPENAPI_URL
+    return get_redoc_html(openapi_url=openapi_url, title=f"{app.title} - ReDoc")
+
 # CORS 설정 제거 - 게이트웨이가 모든 CORS를 처리하므로 백엔드 서비스에서는 제거
 # 프록시/파사드 패턴: 프론트엔드 -> 게이트웨이 -> 백엔드 서비스
 # 게이트웨이만 CORS를 처리하고, 백엔드 서비스는 게이트웨이를 통해서만 접근
@@ -69,6 +106,106 @@ weather_router = APIRouter(prefix="/weather", tags=["weather"])
 MID_FCST_BASE_URL = "https://apis.data.go.kr/1360000/MidFcstInfoService"  # 중기예보
 SHORT_FCST_BASE_URL = "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0"  # 단기예보
 
+# 예보 발표시각 (시) - 같은 발표 구간 내 응답은 변하지 않으므로 ETag/Cache-Control에 사용
+MID_FCST_HOURS = (6, 18)
+SHORT_FCST_HOURS = (2, 5, 8, 11, 14, 17, 20, 23)
+
+def seconds_until_next_slot(slot_hours) -> int:
+    """다음 발표시각까지 남은 초 (Cache-Control max-age 용)"""
+    now = datetime.now()
+    for hour in slot_hours:
+        slot = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+        if slot > now:
+            return int((slot - now).total_seconds())
+    next_slot = (now + timedelta(days=1)).replace(hour=slot_hours[0], minute=0, second=0, microsecond=0)
+    return int((next_slot - now).total_seconds())
+
+def forecast_cache_headers(etag: str, slot_hours) -> Dict[str, str]:
+    """발표 구간 기준 캐시 헤더 생성"""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={seconds_until_next_slot(slot_hours)}"
+    }
+
+# 오류/비정상 응답용 헤더 (클라이언트/CDN이 오류 응답을 발표 구간 동안 재사용하지 않도록)
+NO_STORE_HEADERS = {"Cache-Control": "no-store"}
+
+# 기상청 응답 서버 측 캐시 (ETag -> (만료 시각, 응답))
+# 같은 발표 구간 안의 동일 요청은 기상청을 다시 호출하지 않고 다음 발표시각까지 재사용
+# 정상 응답(resultCode 00)만 저장
+# 엔드포인트가 스레드풀에서 실행되므로 조회/저장/제거는 락 안에서 수행
+FORECAST_CACHE_MAX = 512
+_FORECAST_CACHE: Dict[str, tuple] = {}
+_FORECAST_CACHE_LOCK = threading.Lock()
+
+def forecast_cache_get(key: str):
+    """캐시된 응답 반환 (없거나 만료되었으면 None)"""
+    with _FORECAST_CACHE_LOCK:
+        entry = _FORECAST_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            _FORECAST_CACHE.pop(key, None)
+            return None
+        return entry[1]
+
+def forecast_cache_put(key: str, value, slot_hours) -> None:
+    """다음 발표시각까지 유효한 응답 저장 (가득 차면 가장 오래된 항목 제거)"""
+    expires_at = time.monotonic() + seconds_until_next_slot(slot_hours)
+    with _FORECAST_CACHE_LOCK:
+        if key not in _FORECAST_CACHE and len(_FORECAST_CACHE) >= FORECAST_CACHE_MAX:
+            _FORECAST_CACHE.pop(next(iter(_FORECAST_CACHE)), None)
+        _FORECAST_CACHE[key] = (expires_at, value)
+
+# 예보 엔드포인트 응답 문서 (dataType에 따라 JSON 또는 XML 원본 반환)
+FORECAST_RESPONSES = {
+    200: {
+        "description": "기상청 API 응답 (dataType=JSON이면 JSON, XML이면 원본 XML)",
+        "content": {
+            "application/json": {},
+            "application/xml": {}
+        }
+    }
+}
+
+# 기상청 API 호출용 공유 세션 (keep-alive + 커넥션 풀 재사용으로 매 요청 TCP/TLS 핸드셰이크 생략)
+# 일시적인 연결 오류/5xx는 짧은 지수 백오프로 최대 2회 재시도
+KMA_RETRY = Retry(
+    total=2,
+    connect=2,
+    read=1,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({"GET"}),
+    raise_on_status=False
+)
+SESSION = requests.Session()
+SESSION.mount('https://', requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=KMA_RETRY))
+
+# 스트리밍 응답 앞부분에서 NO_DATA(resultCode 03) 여부를 확인하기 위한 패턴
+KMA_NO_DATA_PATTERN = re.compile(rb'"resultCode"\s*:\s*"03"')
+KMA_HEADER_SCAN_BYTES = 1024
+KMA_CHUNK_SIZE = 65536
+
+def read_kma_json(response) -> dict:
+    """
+    기상청 JSON 응답을 스트리밍으로 읽기
+
+    첫 청크의 앞부분(헤더 위치)에서 NO_DATA가 확인되면 나머지 본문을 받지 않고
+    파싱도 생략한 채 헤더만 담은 결과를 반환합니다.
+    NO_DATA 응답은 100바이트 안팎이라 보통 첫 청크에 전부 들어오므로 길이와 무관하게 검사합니다.
+    """
+    buf = bytearray()
+    scanned = False
+    for chunk in response.iter_content(KMA_CHUNK_SIZE):
+        buf.extend(chunk)
+        if not scanned and buf:
+            scanned = True
+            if KMA_NO_DATA_PATTERN.search(buf, 0, KMA_HEADER_SCAN_BYTES):
+                response.close()
+                return {"response": {"header": {"resultCode": "03", "resultMsg": "NO_DATA"}}}
+    return orjson.loads(buf)
+
 # 중기예보 구역 코드 로드
 REGION_CODE_MAP: Dict[str, str] = {}
 REGION_NAME_MAP: Dict[str, str] = {}  # 지역명 -> regId 매핑
@@ -86,6 +223,35 @@ REGION_TO_STNID: Dict[str, str] = {
     '제주': '184',
 }
 
+# 대소문자 구분 없는 stnId 조회 테이블 (요청마다 원본/소문자 키를 따로 조회하지 않도록 미리 구성)
+_STN_CASEFOLD: Dict[str, str] = {k.casefold(): v for k, v in REGION_TO_STNID.items()}
+_SUPPORTED_REGIONS_STR = ', '.join(REGION_TO_STNID.keys())
+
+def read_region_rows(csv_file: str):
+    """
+    지역 코드 CSV를 (지역명, regId) 목록으로 읽기
+
+    pyarrow가 설치되어 있으면 멀티스레드 CSV 파서를 사용하고,
+    없거나 파싱에 실패하면 표준 csv 모듈로 읽습니다.
+    """
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.csv as pacsv  # type: ignore
+        table = pacsv.read_csv(
+            csv_file,
+            read_options=pacsv.ReadOptions(column_names=['name', 'rid']),
+            parse_options=pacsv.ParseOptions(delimiter=','),
+            convert_options=pacsv.ConvertOptions(column_types={'name': pa.string(), 'rid': pa.string()})
+        )
+        return list(zip(table.column('name').to_pylist(), table.column('rid').to_pylist()))
+    except ImportError:
+        pass
+    except Exception as e:
+        logger.warning("pyarrow CSV 파싱 실패, csv 모듈로 재시도: %s", e)
+    
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        return [(row[0], row[1]) for row in csv.reader(f) if len(row) >= 2]
+
 def load_region_codes():
     """CSV 파일에서 지역 코드 로드"""
     csv_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', '중기예보_중기기온예보구역코드.csv')
@@ -102,27 +268,28 @@ def load_region_codes():
     
     if csv_file:
         try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if len(row) >= 2:
-                        region_name = row[0].strip()
-                        reg_id = row[1].strip()
-                        REGION_CODE_MAP[reg_id] = region_name
-                        REGION_NAME_MAP[region_name] = reg_id
-                        # 대소문자 구분 없이 검색 가능하도록 소문자 키도 추가
-                        REGION_NAME_MAP[region_name.lower()] = reg_id
-            print(f"[날씨 서비스] {len(REGION_NAME_MAP)}개 지역 코드 로드 완료")
+            for name, rid in read_region_rows(csv_file):
+                if name is None or rid is None:
+                    continue
+                region_name = name.strip()
+                reg_id = rid.strip()
+                REGION_CODE_MAP[reg_id] = region_name
+                REGION_NAME_MAP[region_name] = reg_id
+                # 대소문자 구분 없이 검색 가능하도록 소문자 키도 추가
+                REGION_NAME_MAP[region_name.lower()] = reg_id
+            logger.info("%d개 지역 코드 로드 완료", len(REGION_NAME_MAP))
         except Exception as e:
-            print(f"[날씨 서비스] 지역 코드 로드 실패: {e}")
+            logger.exception("지역 코드 로드 실패: %s", e)
     else:
-        print("[날씨 서비스] 지역 코드 CSV 파일을 찾을 수 없습니다. stnId만 사용합니다.")
+        logger.warning("지역 코드 CSV 파일을 찾을 수 없습니다. stnId만 사용합니다.")
 
 # 앱 시작 시 지역 코드 로드
 load_region_codes()
 
-@weather_router.get("/mid-forecast")
+@weather_router.get("/mid-forecast", responses=FORECAST_RESPONSES)
 def get_mid_weather_forecast(
+    request: Request,
+    http_response: Response,
     stnId: str = Query(None, description="지역 코드 (예: 108). regionName 또는 regId와 함께 사용 불가"),
     regionName: str = Query(None, description="지역명 (예: 서울, 인천, 과천 등). stnId 또는 regId와 함께 사용 불가"),
     regId: str = Query(None, description="중기기온예보구역코드 (예: 11B10101). stnId 또는 regionName과 함께 사용 불가"),
@@ -188,23 +355,20 @@ def get_mid_weather_forecast(
     try:
         # regionName이 제공되면 stnId로 변환 (중기예보는 stnId만 지원)
         if regionName:
-            if regionName in REGION_TO_STNID:
-                stnId = REGION_TO_STNID[regionName]
-            elif regionName.lower() in REGION_TO_STNID:
-                stnId = REGION_TO_STNID[regionName.lower()]
-            else:
+            stnId = _STN_CASEFOLD.get(regionName.casefold())
+            if stnId is None:
                 # regId로 변환 시도 (단기예보용, 중기예보에서는 사용 안 함)
                 if regionName in REGION_NAME_MAP:
                     # regId는 중기예보에서 지원하지 않으므로 stnId로 변환 시도
                     # 주요 도시는 stnId로 매핑
                     raise HTTPException(
                         status_code=404,
-                        detail=f"지역명 '{regionName}'에 대한 중기예보 stnId를 찾을 수 없습니다. 지원 지역: 서울, 인천, 강릉, 대전, 대구, 광주, 부산, 울산, 제주"
+                        detail=f"지역명 '{regionName}'에 대한 중기예보 stnId를 찾을 수 없습니다. 지원 지역: {_SUPPORTED_REGIONS_STR}"
                     )
                 else:
                     raise HTTPException(
                         status_code=404,
-                        detail=f"지역명 '{regionName}'을 찾을 수 없습니다. 지원 지역: 서울, 인천, 강릉, 대전, 대구, 광주, 부산, 울산, 제주"
+                        detail=f"지역명 '{regionName}'을 찾을 수 없습니다. 지원 지역: {_SUPPORTED_REGIONS_STR}"
                     )
         
         # tmFc가 제공되지 않으면 자동으로 가장 최근 발표시각 계산
@@ -244,14 +408,29 @@ def get_mid_weather_forecast(
                 detail="중기예보 API는 regId를 지원하지 않습니다. stnId 또는 regionName을 사용하세요."
             )
         
-        response = requests.get(url, params=params, timeout=10)
+        # 같은 발표시각의 예보는 변하지 않으므로 클라이언트 캐시가 유효하면 기상청 호출 생략
+        etag = f'"{stnId}:{tmFc}:{pageNo}:{numOfRows}:{dataType.upper()}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        cache_headers = forecast_cache_headers(etag, MID_FCST_HOURS)
+        
+        cached = forecast_cache_get(etag)
+        if cached is not None:
+            if dataType.upper() == "JSON":
+                http_response.headers.update(cache_headers)
+                return cached
+            return Response(content=cached, media_type="application/xml", headers=cache_headers)
+        
+        response = SESSION.get(url, params=params, timeout=10, stream=True)
         response.raise_for_status()
         
         if dataType.upper() == "JSON":
-            result = response.json()
+            result = read_kma_json(response)
             # 응답 검증 및 정리
-            if 'response' in result:
-                header = result['response'].get('header', {})
+            if (resp := result.get('response')) is not None:
+                header = resp.get('header') or {}
+                body = resp.get('body') or {}
+                items = body.get('items') or {}
                 result_code = header.get('resultCode', '')
                 result_msg = header.get('resultMsg', '')
                 
@@ -260,10 +439,13 @@ def get_mid_weather_forecast(
                     # 다른 발표시각 시도 (오전 6시 <-> 오후 6시)
                     alternative_tmFc = tmFc[:-4] + ('0600' if tmFc[-4:] == '1800' else '1800')
                     params['tmFc'] = alternative_tmFc
-                    retry_response = requests.get(url, params=params, timeout=10)
+                    retry_response = SESSION.get(url, params=params, timeout=10, stream=True)
                     if retry_response.status_code == 200:
-                        retry_result = retry_response.json()
-                        if retry_result.get('response', {}).get('header', {}).get('resultCode') == '00':
+                        retry_result = read_kma_json(retry_response)
+                        retry_header = (retry_result.get('response') or {}).get('header') or {}
+                        if retry_header.get('resultCode') == '00':
+                            forecast_cache_put(etag, retry_result, MID_FCST_HOURS)
+                            http_response.headers.update(cache_headers)
                             return retry_result
                     
                     return {
@@ -280,8 +462,6 @@ def get_mid_weather_forecast(
                     }
                 
                 # items가 빈 문자열이거나 비어있는 경우 처리
-                body = result['response'].get('body', {})
-                items = body.get('items', {})
                 if isinstance(items, dict):
                     item = items.get('item', '')
                     if item == '' or (isinstance(item, list) and len(item) == 0):
@@ -294,9 +474,25 @@ def get_mid_weather_forecast(
                                 }
                             }
                         }
+            # 정상 응답(resultCode 00)만 캐시 저장 및 ETag/Cache-Control 부여
+            if ((result.get('response') or {}).get('header') or {}).get('resultCode') == '00':
+                forecast_cache_put(etag, result, MID_FCST_HOURS)
+                http_response.headers.update(cache_headers)
+            else:
+                http_response.headers.update(NO_STORE_HEADERS)
             return result
         else:
-            return {"content": response.text, "content_type": "XML"}
+            # XML은 JSON 문자열로 감싸지 않고 원본 바이트를 그대로 전달
+            if b"<resultCode>00</resultCode>" in response.content:
+                forecast_cache_put(etag, response.content, MID_FCST_HOURS)
+                headers = cache_headers
+            else:
+                headers = NO_STORE_HEADERS
+            return Response(
+                content=response.content,
+                media_type="application/xml",
+                headers=headers
+            )
             
     except requests.exceptions.RequestException as e:
         raise HTTPException(
@@ -309,8 +505,10 @@ def get_mid_weather_forecast(
             detail=f"Unexpected error: {str(e)}"
         )
 
-@weather_router.get("/short-forecast")
+@weather_router.get("/short-forecast", responses=FORECAST_RESPONSES)
 def get_short_weather_forecast(
+    request: Request,
+    http_response: Response,
     nx: int = Query(..., description="예보지점 X 좌표"),
     ny: int = Query(..., description="예보지점 Y 좌표"),
     base_date: str = Query(None, description="발표일자 (YYYYMMDD 형식, 예: 20240101). 생략 시 자동 계산"),
@@ -429,14 +627,29 @@ def get_short_weather_forecast(
             'ny': str(ny)
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        # 같은 발표시각의 예보는 변하지 않으므로 클라이언트 캐시가 유효하면 기상청 호출 생략
+        etag = f'"{nx}:{ny}:{base_date}:{base_time}:{pageNo}:{numOfRows}:{dataType.upper()}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        cache_headers = forecast_cache_headers(etag, SHORT_FCST_HOURS)
+        
+        cached = forecast_cache_get(etag)
+        if cached is not None:
+            if dataType.upper() == "JSON":
+                http_response.headers.update(cache_headers)
+                return cached
+            return Response(content=cached, media_type="application/xml", headers=cache_headers)
+        
+        response = SESSION.get(url, params=params, timeout=10, stream=True)
         response.raise_for_status()
         
         if dataType.upper() == "JSON":
-            result = response.json()
+            result = read_kma_json(response)
             # 응답 검증 및 정리
-            if 'response' in result:
-                header = result['response'].get('header', {})
+            if (resp := result.get('response')) is not None:
+                header = resp.get('header') or {}
+                body = resp.get('body') or {}
+                items = body.get('items') or {}
                 result_code = header.get('resultCode', '')
                 result_msg = header.get('resultMsg', '')
                 
@@ -456,8 +669,6 @@ def get_short_weather_forecast(
                     }
                 
                 # items가 비어있는 경우 확인
-                body = result['response'].get('body', {})
-                items = body.get('items', {})
                 if isinstance(items, dict):
                     item_list = items.get('item', [])
                     if not item_list or len(item_list) == 0:
@@ -470,9 +681,25 @@ def get_short_weather_forecast(
                                 }
                             }
                         }
+            # 정상 응답(resultCode 00)만 캐시 저장 및 ETag/Cache-Control 부여
+            if ((result.get('response') or {}).get('header') or {}).get('resultCode') == '00':
+                forecast_cache_put(etag, result, SHORT_FCST_HOURS)
+                http_response.headers.update(cache_headers)
+            else:
+                http_response.headers.update(NO_STORE_HEADERS)
             return result
         else:
-            return {"content": response.text, "content_type": "XML"}
+            # XML은 JSON 문자열로 감싸지 않고 원본 바이트를 그대로 전달
+            if b"<resultCode>00</resultCode>" in response.content:
+                forecast_cache_put(etag, response.content, SHORT_FCST_HOURS)
+                headers = cache_headers
+            else:
+                headers = NO_STORE_HEADERS
+            return Response(
+                content=response.content,
+                media_type="application/xml",
+                headers=headers
+            )
             
     except requests.exceptions.RequestException as e:
         raise HTTPException(
@@ -527,6 +754,11 @@ def health_check():
 # 서브 라우터를 앱에 포함
 app.include_router(weather_router)
 
+@app.on_event("startup")
+def build_openapi_bytes():
+    """모든 라우터 등록 후 OpenAPI 스키마를 한 번만 생성하여 바이트로 고정"""
+    app.state.openapi_bytes = orjson.dumps(app.openapi())
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=9004, root_path=root_path)
 
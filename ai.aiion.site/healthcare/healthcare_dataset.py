@@ -2,10 +2,12 @@
 건강 데이터셋 로딩 및 전처리 모듈
 """
 import pandas as pd
-import numpy as np
-from typing import Tuple, Optional
+from typing import Optional
 from pathlib import Path
 import os
+import logging
+
+logger = logging.getLogger("healthcare")
 
 
 class HealthcareDataset:
@@ -26,6 +28,7 @@ class HealthcareDataset:
         self.csv_path = csv_path
         self.df: Optional[pd.DataFrame] = None
         self.processed_df: Optional[pd.DataFrame] = None
+        self._stats: Optional[dict] = None
         
     def load_data(self) -> pd.DataFrame:
         """
@@ -37,12 +40,12 @@ class HealthcareDataset:
         if not os.path.exists(self.csv_path):
             raise FileNotFoundError(f"CSV 파일을 찾을 수 없습니다: {self.csv_path}")
         
-        print(f"CSV 파일 로딩 중: {self.csv_path}")
+        logger.info("CSV 파일 로딩 중: %s", self.csv_path)
         
         # UTF-8 인코딩으로 CSV 파일 읽기
         self.df = pd.read_csv(self.csv_path, encoding='utf-8')
         
-        print(f"로딩된 데이터: {len(self.df)}개 행, {len(self.df.columns)}개 컬럼")
+        logger.info("로딩된 데이터: %d개 행, %d개 컬럼", len(self.df), len(self.df.columns))
         
         # 필요한 컬럼만 선택 (빈 컬럼 제거)
         # 실제 CSV 파일의 컬럼명 확인: '병 명(Label2)' (공백 포함)
@@ -51,13 +54,13 @@ class HealthcareDataset:
         # 컬럼명이 정확히 일치하는지 확인
         missing_columns = [col for col in required_columns if col not in self.df.columns]
         if missing_columns:
-            print(f"경고: 다음 컬럼을 찾을 수 없습니다: {missing_columns}")
-            print(f"실제 컬럼명: {self.df.columns.tolist()[:10]}")
+            logger.warning("다음 컬럼을 찾을 수 없습니다: %s", missing_columns)
+            logger.warning("실제 컬럼명: %s", self.df.columns.tolist()[:10])
             # 유사한 컬럼명 찾기 시도
             for missing_col in missing_columns:
                 similar_cols = [col for col in self.df.columns if missing_col.replace(' ', '') in col.replace(' ', '')]
                 if similar_cols:
-                    print(f"  '{missing_col}' 대신 '{similar_cols[0]}' 사용")
+                    logger.warning("'%s' 대신 '%s' 사용", missing_col, similar_cols[0])
                     required_columns = [similar_cols[0] if col == missing_col else col for col in required_columns]
         
         self.df = self.df[required_columns].copy()
@@ -65,7 +68,7 @@ class HealthcareDataset:
         # 컬럼명 정리
         self.df.columns = ['index', 'symptom', 'accompanying_symptom', 'age', 'gender', 'label1', 'label2']
         
-        print(f"전처리된 데이터: {len(self.df)}개 행")
+        logger.info("전처리된 데이터: %d개 행", len(self.df))
         
         return self.df
     
@@ -118,6 +121,7 @@ class HealthcareDataset:
         df['combined_symptom'] = df['symptom'] + ' ' + df['accompanying_symptom']
         
         self.processed_df = df
+        self._stats = None
         
         return df
     
@@ -146,6 +150,9 @@ class HealthcareDataset:
         Returns:
             통계 정보 딕셔너리
         """
+        if self._stats is not None:
+            return self._stats
+        
         if self.processed_df is None:
             self.preprocess_data()
         
@@ -162,5 +169,16 @@ class HealthcareDataset:
             'gender_distribution': df['gender'].value_counts().to_dict()
         }
         
+        self._stats = stats
         return stats
+    
+    def invalidate(self) -> None:
+        """
+        캐시된 원본/전처리 데이터 및 통계 초기화
+        
+        CSV 파일이 변경된 경우 호출하면 다음 조회 시 다시 로딩합니다.
+        """
+        self.df = None
+        self.processed_df = None
+        self._stats = None
 
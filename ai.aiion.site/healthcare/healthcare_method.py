@@ -6,11 +6,17 @@ import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
 from typing import Dict, Tuple, Optional
-import os
+import functools
+import logging
 
 from healthcare_dataset import HealthcareDataset
 from healthcare_model import HealthcareModel
 
+# 성별 인코딩용 범주형 dtype (남성: 0, 여성: 1, 그 외: -1 -> 0으로 보정)
+_GENDER_CATS = pd.CategoricalDtype(categories=['남성', '여성'])
+
+logger = logging.getLogger("healthcare")
+
 
 class HealthcareMethod:
     """건강 데이터 학습 및 예측 메서드"""
@@ -25,6 +31,11 @@ class HealthcareMethod:
         """
         self.dataset = dataset or HealthcareDataset()
         self.model = model or HealthcareModel()
+        
+        # 단일 샘플 예측 결과 캐시 (동일 증상 질의는 sklearn 추론 생략)
+        # 인스턴스별로 바인딩하여 메서드 lru_cache의 인스턴스 누수를 방지
+        # 키에 모델 세대 번호를 포함하여 재학습 전 결과가 재학습 후 질의에 반환되지 않도록 함
+        self._predict_cached = functools.lru_cache(maxsize=8192)(self._predict_uncached)
     
     def train_model(
         self,
@@ -44,13 +55,13 @@ class HealthcareMethod:
             학습 결과 딕셔너리
         """
         # 데이터 로딩 및 전처리
-        print("데이터 로딩 중...")
+        logger.info("데이터 로딩 중...")
         df = self.dataset.preprocess_data()
         
-        print(f"전처리된 데이터: {len(df)}개 샘플")
+        logger.info("전처리된 데이터: %d개 샘플", len(df))
         
         # 특징 준비
-        print("특징 준비 중...")
+        logger.info("특징 준비 중...")
         X_text, X_numeric = self.model.prepare_features(df, is_training=True)
         
         # 타겟 준비
@@ -58,7 +69,7 @@ class HealthcareMethod:
         y_label2 = df['label2'].values
         
         # 학습/테스트 분할
-        print("데이터 분할 중...")
+        logger.info("데이터 분할 중...")
         X_text_train, X_text_test, X_numeric_train, X_numeric_test, y_label1_train, y_label1_test, y_label2_train, y_label2_test = train_test_split(
             X_text, X_numeric, y_label1, y_label2,
             test_size=test_size,
@@ -66,8 +77,8 @@ class HealthcareMethod:
             stratify=y_label1  # Label1 기준으로 계층적 분할
         )
         
-        print(f"학습 데이터: {len(X_text_train)}개")
-        print(f"테스트 데이터: {len(X_text_test)}개")
+        logger.info("학습 데이터: %d개", len(X_text_train))
+        logger.info("테스트 데이터: %d개", len(X_text_test))
         
         # 모델 학습
         self.model.train(
@@ -76,7 +87,7 @@ class HealthcareMethod:
         )
         
         # 테스트 데이터로 평가
-        print("\n모델 평가 중...")
+        logger.info("모델 평가 중...")
         label1_pred, label2_pred = self.model.predict(X_text_test, X_numeric_test)
         
         # Label1 평가
@@ -87,13 +98,16 @@ class HealthcareMethod:
         label2_accuracy = accuracy_score(y_label2_test, label2_pred)
         label2_report = classification_report(y_label2_test, label2_pred, output_dict=True)
         
-        print(f"\nLabel1 정확도: {label1_accuracy:.4f}")
-        print(f"Label2 정확도: {label2_accuracy:.4f}")
+        logger.info("Label1 정확도: %.4f", label1_accuracy)
+        logger.info("Label2 정확도: %.4f", label2_accuracy)
         
         # 모델 저장
         if save_model:
             self.model.save()
         
+        # 이전 세대 모델의 캐시 항목 정리 (세대 번호가 키에 포함되므로 정확성과는 무관, 메모리 회수용)
+        self._predict_cached.cache_clear()
+        
         # 결과 반환
         results = {
             'label1_accuracy': float(label1_accuracy),
@@ -125,45 +139,55 @@ class HealthcareMethod:
         Returns:
             예측 결과 딕셔너리
         """
-        # 모델이 로드되지 않았으면 로드 시도
-        try:
-            if self.model.label1_model is None:
-                self.model.load()
-        except FileNotFoundError:
-            raise ValueError("모델이 학습되지 않았습니다. 먼저 train_model()을 호출하세요.")
-        
-        # 입력 데이터를 DataFrame으로 변환
-        data = {
-            'symptom': [symptom],
-            'accompanying_symptom': [accompanying_symptom],
-            'age': [age],
-            'gender': [gender]
-        }
-        df = pd.DataFrame(data)
-        
-        # 전처리 (성별 인코딩 등)
-        df['gender_encoded'] = df['gender'].map({'남성': 0, '여성': 1}).fillna(0).astype(int)
-        df['combined_symptom'] = df['symptom'] + ' ' + df['accompanying_symptom']
-        
-        # 특징 준비
-        X_text, X_numeric = self.model.prepare_features(df, is_training=False)
-        
-        # 예측
-        label1_pred, label2_pred = self.model.predict(X_text, X_numeric)
-        
-        # 확률 예측
-        label1_proba, label2_proba = self.model.predict_proba(X_text, X_numeric)
+        label1, label2, label1_proba, label2_proba = self._predict_cached(
+            self.model.version, symptom, accompanying_symptom, age, gender
+        )
         
         # 결과 반환
         result = {
-            'label1': int(label1_pred[0]),
-            'label2': int(label2_pred[0]),
-            'label1_proba': label1_proba[0].tolist(),
-            'label2_proba': label2_proba[0].tolist()
+            'label1': label1,
+            'label2': label2,
+            'label1_proba': list(label1_proba),
+            'label2_proba': list(label2_proba)
         }
         
         return result
     
+    def _predict_uncached(
+        self,
+        model_version: int,
+        symptom: str,
+        accompanying_symptom: str,
+        age: int,
+        gender: str
+    ) -> Tuple[int, int, Tuple[float, ...], Tuple[float, ...]]:
+        """
+        단일 샘플 예측 (캐시 미적용)
+        
+        model_version은 캐시 키로만 사용됩니다. 키를 읽은 뒤 재학습이 끝나면
+        더 새로운 세대의 결과가 이전 세대 키에 저장될 뿐, 이전 모델의 결과가
+        새 세대 키로 저장되는 경우는 없습니다.
+        
+        Returns:
+            (label1, label2, label1_proba, label2_proba) 해시 가능한 튜플
+        """
+        # 전처리 (단일 샘플은 DataFrame 없이 바로 특징 생성)
+        combined_symptom = f"{symptom} {accompanying_symptom}"
+        gender_code = 1 if gender == '여성' else 0
+        
+        # 예측 (벡터화기와 모델은 같은 세대를 사용)
+        _, label1_pred, label2_pred, label1_proba, label2_proba = self.model.predict_texts(
+            [combined_symptom],
+            np.array([[age, gender_code]], dtype=np.float32)
+        )
+        
+        return (
+            int(label1_pred[0]),
+            int(label2_pred[0]),
+            tuple(label1_proba[0].tolist()),
+            tuple(label2_proba[0].tolist())
+        )
+    
     def batch_predict(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         배치 예측
@@ -174,23 +198,17 @@ class HealthcareMethod:
         Returns:
             예측 결과가 추가된 DataFrame
         """
-        # 모델이 로드되지 않았으면 로드 시도
-        try:
-            if self.model.label1_model is None:
-                self.model.load()
-        except FileNotFoundError:
-            raise ValueError("모델이 학습되지 않았습니다. 먼저 train_model()을 호출하세요.")
-        
         # 전처리
         df = df.copy()
-        df['gender_encoded'] = df['gender'].map({'남성': 0, '여성': 1}).fillna(0).astype(int)
+        df['gender_encoded'] = df['gender'].astype(_GENDER_CATS).cat.codes.clip(lower=0).astype(np.int8)
         df['combined_symptom'] = df['symptom'] + ' ' + df['accompanying_symptom']
         
-        # 특징 준비
-        X_text, X_numeric = self.model.prepare_features(df, is_training=False)
-        
-        # 예측
-        label1_pred, label2_pred = self.model.predict(X_text, X_numeric)
+        # 예측 (벡터화기와 모델은 같은 세대를 사용)
+        _, label1_pred, label2_pred, _, _ = self.model.predict_texts(
+            df['combined_symptom'].tolist(),
+            df[['age', 'gender_encoded']].values,
+            with_proba=False
+        )
         
         # 결과 추가
         df['predicted_label1'] = label1_pred
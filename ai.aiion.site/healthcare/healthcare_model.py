@@ -4,14 +4,15 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import StandardScaler
-from sklearn.compose import ColumnTransformer
 import numpy as np
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import joblib
-import os
+import logging
+import threading
 from pathlib import Path
 
+logger = logging.getLogger("healthcare")
+
 
 class HealthcareModel:
     """건강 데이터 분류 모델"""
@@ -39,31 +40,35 @@ class HealthcareModel:
         # 텍스트 벡터화기
         self.text_vectorizer: Optional[TfidfVectorizer] = None
         
+        # 학습 중인 벡터화기 (train()에서 모델과 함께 교체되기 전까지 예측에 사용되지 않음)
+        self._staged_vectorizer: Optional[TfidfVectorizer] = None
+        
+        # 벡터화기/모델 교체 락 및 모델 세대 번호
+        # 예측은 snapshot()으로 같은 세대의 벡터화기와 모델을 함께 사용
+        self._lock = threading.Lock()
+        self.version = 0
+        
         # 모델 파일 경로
         self.label1_model_path = self.model_dir / "label1_model.joblib"
         self.label2_model_path = self.model_dir / "label2_model.joblib"
         self.vectorizer_path = self.model_dir / "text_vectorizer.joblib"
     
-    def create_model(self) -> Tuple[Pipeline, Pipeline]:
-        """
-        모델 생성
-        
-        Returns:
-            (label1_model, label2_model) 튜플
-        """
-        # 텍스트 벡터화기 (증상 텍스트용)
+    @staticmethod
+    def _new_vectorizer() -> TfidfVectorizer:
+        """텍스트 벡터화기 (증상 텍스트용) 생성"""
         # max_features를 제한하여 메모리 사용량 감소
-        text_vectorizer = TfidfVectorizer(
+        return TfidfVectorizer(
             max_features=5000,
             ngram_range=(1, 2),  # 단어와 2-gram 사용
             min_df=2,  # 최소 2번 이상 등장한 단어만 사용
             max_df=0.95,  # 95% 이상 문서에 등장한 단어 제외
             stop_words=None  # 한국어는 별도 처리 필요
         )
-        
-        # Label1 모델 (진료과 분류)
-        # 텍스트 특징과 수치 특징을 결합하는 파이프라인
-        label1_model = RandomForestClassifier(
+    
+    @staticmethod
+    def _new_classifier() -> RandomForestClassifier:
+        """RandomForest 분류기 생성 (Label1: 진료과, Label2: 병명 공통 설정)"""
+        return RandomForestClassifier(
             n_estimators=200,
             max_depth=30,
             min_samples_split=5,
@@ -72,21 +77,34 @@ class HealthcareModel:
             n_jobs=-1,
             class_weight='balanced'  # 클래스 불균형 처리
         )
+    
+    def _swap(self, text_vectorizer, label1_model, label2_model):
+        """벡터화기와 두 모델을 한 번에 교체하고 세대 번호 증가"""
+        with self._lock:
+            self.text_vectorizer = text_vectorizer
+            self.label1_model = label1_model
+            self.label2_model = label2_model
+            self.version += 1
+    
+    def snapshot(self) -> Tuple[int, Optional[TfidfVectorizer], Optional[RandomForestClassifier], Optional[RandomForestClassifier]]:
+        """
+        현재 세대의 (version, 벡터화기, Label1 모델, Label2 모델) 반환
         
-        # Label2 모델 (병명 분류)
-        label2_model = RandomForestClassifier(
-            n_estimators=200,
-            max_depth=30,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42,
-            n_jobs=-1,
-            class_weight='balanced'  # 클래스 불균형 처리
-        )
+        학습 중 교체가 일어나도 한 번의 예측 안에서는 같은 세대의 객체만 사용하도록 합니다.
+        """
+        with self._lock:
+            return self.version, self.text_vectorizer, self.label1_model, self.label2_model
+    
+    def create_model(self) -> Tuple[RandomForestClassifier, RandomForestClassifier]:
+        """
+        모델 생성
         
-        self.text_vectorizer = text_vectorizer
-        self.label1_model = label1_model
-        self.label2_model = label2_model
+        Returns:
+            (label1_model, label2_model) 튜플
+        """
+        label1_model = self._new_classifier()
+        label2_model = self._new_classifier()
+        self._swap(self._new_vectorizer(), label1_model, label2_model)
         
         return label1_model, label2_model
     
@@ -105,10 +123,13 @@ class HealthcareModel:
         combined_text = df['combined_symptom'].values
         
         if is_training:
-            # 학습 모드: 벡터화기 학습
-            text_features = self.text_vectorizer.fit_transform(combined_text).toarray()
+            # 학습 모드: 새 벡터화기를 학습 (사용 중인 벡터화기는 train()에서 교체될 때까지 유지)
+            self._staged_vectorizer = self._new_vectorizer()
+            text_features = self._staged_vectorizer.fit_transform(combined_text).toarray()
         else:
-            # 예측 모드: 기존 벡터화기 사용
+            # 예측 모드: 기존 벡터화기 사용 (모델은 앱 시작 시 로드됨)
+            if self.text_vectorizer is None:
+                raise ValueError("모델이 학습되지 않았습니다. 먼저 train_model()을 호출하세요.")
             text_features = self.text_vectorizer.transform(combined_text).toarray()
         
         # 수치 특징 (연령대, 성별)
@@ -116,6 +137,37 @@ class HealthcareModel:
         
         return text_features, numeric_features
     
+    def predict_texts(
+        self,
+        texts: List[str],
+        numeric_features: np.ndarray,
+        with_proba: bool = True
+    ) -> Tuple[int, np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        텍스트 입력 예측 (같은 세대의 벡터화기와 모델 사용)
+        
+        Args:
+            texts: 증상 + 동반증상 결합 텍스트 리스트
+            numeric_features: 수치 특징 행렬 (연령대, 성별 코드)
+            with_proba: 확률 예측 포함 여부
+            
+        Returns:
+            (version, label1_pred, label2_pred, label1_proba, label2_proba) 튜플
+        """
+        version, text_vectorizer, label1_model, label2_model = self.snapshot()
+        if text_vectorizer is None or label1_model is None or label2_model is None:
+            raise ValueError("모델이 학습되지 않았습니다. 먼저 train_model()을 호출하세요.")
+        
+        text_features = text_vectorizer.transform(texts).toarray()
+        X_combined = np.hstack([text_features, numeric_features])
+        
+        label1_pred = label1_model.predict(X_combined)
+        label2_pred = label2_model.predict(X_combined)
+        label1_proba = label1_model.predict_proba(X_combined) if with_proba else None
+        label2_proba = label2_model.predict_proba(X_combined) if with_proba else None
+        
+        return version, label1_pred, label2_pred, label1_proba, label2_proba
+    
     def train(self, X_text: np.ndarray, X_numeric: np.ndarray, y_label1: np.ndarray, y_label2: np.ndarray):
         """
         모델 학습
@@ -126,20 +178,27 @@ class HealthcareModel:
             y_label1: Label1 타겟
             y_label2: Label2 타겟
         """
-        if self.label1_model is None or self.label2_model is None:
-            self.create_model()
+        # 새 객체에 학습한 뒤 한 번에 교체 (학습 중에도 예측은 기존 모델로 계속 처리)
+        text_vectorizer = self._staged_vectorizer or self.text_vectorizer
+        if text_vectorizer is None:
+            raise ValueError("벡터화기가 학습되지 않았습니다. prepare_features(is_training=True)를 먼저 호출하세요.")
+        label1_model = self._new_classifier()
+        label2_model = self._new_classifier()
         
         # 특징 결합
         X_combined = np.hstack([X_text, X_numeric])
         
         # 모델 학습
-        print("Label1 모델 학습 중...")
-        self.label1_model.fit(X_combined, y_label1)
+        logger.info("Label1 모델 학습 중...")
+        label1_model.fit(X_combined, y_label1)
         
-        print("Label2 모델 학습 중...")
-        self.label2_model.fit(X_combined, y_label2)
+        logger.info("Label2 모델 학습 중...")
+        label2_model.fit(X_combined, y_label2)
         
-        print("모델 학습 완료!")
+        self._swap(text_vectorizer, label1_model, label2_model)
+        self._staged_vectorizer = None
+        
+        logger.info("모델 학습 완료!")
     
     def predict(self, X_text: np.ndarray, X_numeric: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -152,15 +211,16 @@ class HealthcareModel:
         Returns:
             (label1_predictions, label2_predictions) 튜플
         """
-        if self.label1_model is None or self.label2_model is None:
+        _, _, label1_model, label2_model = self.snapshot()
+        if label1_model is None or label2_model is None:
             raise ValueError("모델이 학습되지 않았습니다. train() 메서드를 먼저 호출하세요.")
         
         # 특징 결합
         X_combined = np.hstack([X_text, X_numeric])
         
         # 예측
-        label1_pred = self.label1_model.predict(X_combined)
-        label2_pred = self.label2_model.predict(X_combined)
+        label1_pred = label1_model.predict(X_combined)
+        label2_pred = label2_model.predict(X_combined)
         
         return label1_pred, label2_pred
     
@@ -175,37 +235,41 @@ class HealthcareModel:
         Returns:
             (label1_proba, label2_proba) 튜플
         """
-        if self.label1_model is None or self.label2_model is None:
+        _, _, label1_model, label2_model = self.snapshot()
+        if label1_model is None or label2_model is None:
             raise ValueError("모델이 학습되지 않았습니다. train() 메서드를 먼저 호출하세요.")
         
         # 특징 결합
         X_combined = np.hstack([X_text, X_numeric])
         
         # 확률 예측
-        label1_proba = self.label1_model.predict_proba(X_combined)
-        label2_proba = self.label2_model.predict_proba(X_combined)
+        label1_proba = label1_model.predict_proba(X_combined)
+        label2_proba = label2_model.predict_proba(X_combined)
         
         return label1_proba, label2_proba
     
     def save(self):
         """모델 저장"""
-        if self.label1_model is None or self.label2_model is None:
+        _, text_vectorizer, label1_model, label2_model = self.snapshot()
+        if label1_model is None or label2_model is None:
             raise ValueError("저장할 모델이 없습니다.")
         
-        joblib.dump(self.label1_model, self.label1_model_path)
-        joblib.dump(self.label2_model, self.label2_model_path)
-        joblib.dump(self.text_vectorizer, self.vectorizer_path)
+        joblib.dump(label1_model, self.label1_model_path)
+        joblib.dump(label2_model, self.label2_model_path)
+        joblib.dump(text_vectorizer, self.vectorizer_path)
         
-        print(f"모델이 저장되었습니다: {self.model_dir}")
+        logger.info("모델이 저장되었습니다: %s", self.model_dir)
     
     def load(self):
         """모델 로드"""
         if not self.label1_model_path.exists() or not self.label2_model_path.exists():
             raise FileNotFoundError("저장된 모델을 찾을 수 없습니다. 먼저 모델을 학습하세요.")
         
-        self.label1_model = joblib.load(self.label1_model_path)
-        self.label2_model = joblib.load(self.label2_model_path)
-        self.text_vectorizer = joblib.load(self.vectorizer_path)
+        self._swap(
+            joblib.load(self.vectorizer_path),
+            joblib.load(self.label1_model_path),
+            joblib.load(self.label2_model_path)
+        )
         
-        print(f"모델이 로드되었습니다: {self.model_dir}")
+        logger.info("모델이 로드되었습니다: %s", self.model_dir)
 
@@ -1,11 +1,18 @@
 """
 건강 데이터 FastAPI 라우터
 """
-from fastapi import APIRouter, HTTPException
+import asyncio
+import concurrent.futures
+import functools
+import logging
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, HTTPException
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
 from healthcare_service import HealthcareService
 
+logger = logging.getLogger("healthcare")
+
 # 라우터 생성
 healthcare_router = APIRouter(
     prefix="/healthcare",
@@ -15,6 +22,28 @@ healthcare_router = APIRouter(
 # 서비스 인스턴스
 healthcare_service = HealthcareService()
 
+# sklearn 학습/예측 전용 스레드 풀 (이벤트 루프 블로킹 방지)
+# 학습은 CPU를 과점유하지 않도록 한 번에 하나씩 직렬화
+_TRAIN_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='hc-train')
+_PREDICT_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='hc-pred')
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 시작 시 저장된 모델을 미리 로드
+
+    첫 요청이 모델 로드 비용을 부담하지 않도록 startup 단계에서 로드합니다.
+    저장된 모델이 없으면 건너뛰고 /train 으로 학습할 수 있도록 둡니다.
+    """
+    try:
+        healthcare_service.method.model.load()
+    except FileNotFoundError:
+        logger.warning("저장된 모델이 없습니다. /healthcare/train 으로 먼저 학습하세요.")
+    yield
+    _TRAIN_POOL.shutdown(wait=False)
+    _PREDICT_POOL.shutdown(wait=False)
+
 
 # 요청 모델
 class TrainRequest(BaseModel):
@@ -25,18 +54,19 @@ class TrainRequest(BaseModel):
 
 class PredictRequest(BaseModel):
     """예측 요청"""
-    symptom: str = Field(..., description="증상")
-    accompanying_symptom: str = Field(..., description="동반증상")
+    symptom: str = Field(..., min_length=1, description="증상")
+    accompanying_symptom: str = Field(..., min_length=1, description="동반증상")
     age: int = Field(..., ge=0, le=150, description="연령대")
-    gender: str = Field(..., pattern="^(남성|여성)$", description="성별 (남성 또는 여성)")
+    gender: Literal["남성", "여성"] = Field(..., description="성별 (남성 또는 여성)")
 
 
 # 응답 모델
 class TrainResponse(BaseModel):
     """모델 학습 응답"""
     status: str
-    message: str
+    message: Optional[str] = None
     results: Optional[dict] = None
+    code: Optional[str] = None
     error: Optional[str] = None
 
 
@@ -45,6 +75,7 @@ class PredictResponse(BaseModel):
     status: str
     prediction: Optional[dict] = None
     message: Optional[str] = None
+    code: Optional[str] = None
     error: Optional[str] = None
 
 
@@ -53,6 +84,7 @@ class ModelInfoResponse(BaseModel):
     status: str
     info: Optional[dict] = None
     message: Optional[str] = None
+    code: Optional[str] = None
     error: Optional[str] = None
 
 
@@ -61,6 +93,7 @@ class DatasetStatsResponse(BaseModel):
     status: str
     stats: Optional[dict] = None
     message: Optional[str] = None
+    code: Optional[str] = None
     error: Optional[str] = None
 
 
@@ -72,13 +105,18 @@ async def train_model(request: TrainRequest):
     - **test_size**: 테스트 데이터 비율 (0.1 ~ 0.5)
     - **save_model**: 모델 저장 여부
     """
-    result = healthcare_service.train(
-        test_size=request.test_size,
-        save_model=request.save_model
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(
+        _TRAIN_POOL,
+        functools.partial(
+            healthcare_service.train,
+            test_size=request.test_size,
+            save_model=request.save_model
+        )
     )
     
     if result['status'] == 'error':
-        raise HTTPException(status_code=500, detail=result['message'])
+        raise HTTPException(status_code=500, detail={'code': result['code'], 'error': result['error']})
     
     return result
 
@@ -93,21 +131,27 @@ async def predict(request: PredictRequest):
     - **age**: 연령대 (0 ~ 150)
     - **gender**: 성별 (남성 또는 여성)
     """
-    result = healthcare_service.predict(
-        symptom=request.symptom,
-        accompanying_symptom=request.accompanying_symptom,
-        age=request.age,
-        gender=request.gender
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(
+        _PREDICT_POOL,
+        functools.partial(
+            healthcare_service.predict,
+            symptom=request.symptom,
+            accompanying_symptom=request.accompanying_symptom,
+            age=request.age,
+            gender=request.gender
+        )
     )
     
     if result['status'] == 'error':
-        raise HTTPException(status_code=400, detail=result['message'])
+        raise HTTPException(status_code=400, detail={'code': result['code'], 'error': result['error']})
     
     return result
 
 
+# 모델 파일/데이터셋 접근이 포함되므로 동기 함수로 선언하여 FastAPI 스레드풀에서 실행
 @healthcare_router.get("/model/info", response_model=ModelInfoResponse)
-async def get_model_info():
+def get_model_info():
     """
     모델 정보 조회
     
@@ -116,13 +160,14 @@ async def get_model_info():
     result = healthcare_service.get_model_info()
     
     if result['status'] == 'error':
-        raise HTTPException(status_code=500, detail=result['message'])
+        raise HTTPException(status_code=500, detail={'code': result['code'], 'error': result['error']})
     
     return result
 
 
+# 최초 호출 시 CSV 로딩/전처리가 포함되므로 동기 함수로 선언하여 FastAPI 스레드풀에서 실행
 @healthcare_router.get("/dataset/stats", response_model=DatasetStatsResponse)
-async def get_dataset_stats():
+def get_dataset_stats():
     """
     데이터셋 통계 정보 조회
     
@@ -131,7 +176,22 @@ async def get_dataset_stats():
     result = healthcare_service.get_dataset_stats()
     
     if result['status'] == 'error':
-        raise HTTPException(status_code=500, detail=result['message'])
+        raise HTTPException(status_code=500, detail={'code': result['code'], 'error': result['error']})
+    
+    return result
+
+
+@healthcare_router.post("/dataset/invalidate", response_model=DatasetStatsResponse)
+async def invalidate_dataset():
+    """
+    데이터셋 캐시 초기화
+    
+    CSV 파일이 변경된 경우 호출하면 다음 /dataset/stats 요청에서 다시 로딩합니다.
+    """
+    result = healthcare_service.invalidate_dataset()
+    
+    if result['status'] == 'error':
+        raise HTTPException(status_code=500, detail={'code': result['code'], 'error': result['error']})
     
     return result
 
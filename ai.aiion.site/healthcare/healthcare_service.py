@@ -1,10 +1,31 @@
 """
 건강 데이터 서비스 레이어
 """
-from typing import Dict, Optional
+from functools import wraps
+from typing import Callable, Dict
 from healthcare_method import HealthcareMethod
-from healthcare_dataset import HealthcareDataset
-from healthcare_model import HealthcareModel
+
+
+def safe_response(code: str):
+    """
+    서비스 메서드 공통 예외 처리 데코레이터
+    
+    Args:
+        code: 오류 코드 (예: "TRAIN_FAILED", 메시지 현지화는 프론트엔드에서 처리)
+    """
+    def decorator(func: Callable[..., Dict]):
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Dict:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                return {
+                    'status': 'error',
+                    'code': code,
+                    'error': str(e)
+                }
+        return wrapper
+    return decorator
 
 
 class HealthcareService:
@@ -15,6 +36,7 @@ class HealthcareService:
         self.method = HealthcareMethod()
         self._model_trained = False
     
+    @safe_response("TRAIN_FAILED")
     def train(self, test_size: float = 0.2, save_model: bool = True) -> Dict:
         """
         모델 학습
@@ -26,24 +48,18 @@ class HealthcareService:
         Returns:
             학습 결과
         """
-        try:
-            results = self.method.train_model(
-                test_size=test_size,
-                save_model=save_model
-            )
-            self._model_trained = True
-            return {
-                'status': 'success',
-                'message': '모델 학습이 완료되었습니다.',
-                'results': results
-            }
-        except Exception as e:
-            return {
-                'status': 'error',
-                'message': f'모델 학습 중 오류가 발생했습니다: {str(e)}',
-                'error': str(e)
-            }
+        results = self.method.train_model(
+            test_size=test_size,
+            save_model=save_model
+        )
+        self._model_trained = True
+        return {
+            'status': 'success',
+            'message': '모델 학습이 완료되었습니다.',
+            'results': results
+        }
     
+    @safe_response("PREDICT_FAILED")
     def predict(
         self,
         symptom: str,
@@ -63,45 +79,20 @@ class HealthcareService:
         Returns:
             예측 결과
         """
-        try:
-            # 입력 검증
-            if not symptom or not accompanying_symptom:
-                return {
-                    'status': 'error',
-                    'message': '증상과 동반증상을 모두 입력해주세요.'
-                }
-            
-            if age < 0 or age > 150:
-                return {
-                    'status': 'error',
-                    'message': '올바른 연령대를 입력해주세요.'
-                }
-            
-            if gender not in ['남성', '여성']:
-                return {
-                    'status': 'error',
-                    'message': '성별은 "남성" 또는 "여성"으로 입력해주세요.'
-                }
-            
-            # 예측 수행
-            result = self.method.predict(
-                symptom=symptom,
-                accompanying_symptom=accompanying_symptom,
-                age=age,
-                gender=gender
-            )
-            
-            return {
-                'status': 'success',
-                'prediction': result
-            }
-        except Exception as e:
-            return {
-                'status': 'error',
-                'message': f'예측 중 오류가 발생했습니다: {str(e)}',
-                'error': str(e)
-            }
+        # 입력 검증은 라우터의 PredictRequest(Pydantic)에서 수행
+        result = self.method.predict(
+            symptom=symptom,
+            accompanying_symptom=accompanying_symptom,
+            age=age,
+            gender=gender
+        )
+        
+        return {
+            'status': 'success',
+            'prediction': result
+        }
     
+    @safe_response("MODEL_INFO_FAILED")
     def get_model_info(self) -> Dict:
         """
         모델 정보 조회
@@ -109,19 +100,13 @@ class HealthcareService:
         Returns:
             모델 정보
         """
-        try:
-            info = self.method.get_model_info()
-            return {
-                'status': 'success',
-                'info': info
-            }
-        except Exception as e:
-            return {
-                'status': 'error',
-                'message': f'모델 정보 조회 중 오류가 발생했습니다: {str(e)}',
-                'error': str(e)
-            }
+        info = self.method.get_model_info()
+        return {
+            'status': 'success',
+            'info': info
+        }
     
+    @safe_response("DATASET_STATS_FAILED")
     def get_dataset_stats(self) -> Dict:
         """
         데이터셋 통계 정보 조회
@@ -129,19 +114,24 @@ class HealthcareService:
         Returns:
             데이터셋 통계 정보
         """
-        try:
-            # 데이터 로딩 및 전처리
-            self.method.dataset.preprocess_data()
-            stats = self.method.dataset.get_stats()
-            
-            return {
-                'status': 'success',
-                'stats': stats
-            }
-        except Exception as e:
-            return {
-                'status': 'error',
-                'message': f'데이터셋 통계 조회 중 오류가 발생했습니다: {str(e)}',
-                'error': str(e)
-            }
-
+        # 전처리 결과와 통계는 데이터셋 인스턴스에 캐시됨 (최초 호출 시에만 로딩)
+        stats = self.method.dataset.get_stats()
+        
+        return {
+            'status': 'success',
+            'stats': stats
+        }
+    
+    @safe_response("DATASET_INVALIDATE_FAILED")
+    def invalidate_dataset(self) -> Dict:
+        """
+        데이터셋 캐시 초기화
+        
+        Returns:
+            처리 결과
+        """
+        self.method.dataset.invalidate()
+        return {
+            'status': 'success',
+            'message': '데이터셋 캐시가 초기화되었습니다.'
+        }
@@ -1,23 +1,39 @@
 """
 건강 데이터 ML 서비스 메인 앱
 """
+import os
+
+# BLAS/OpenMP 스레드 수 제한 (numpy/sklearn import 전에 설정해야 적용됨)
+# 워커 프로세스마다 코어 수만큼 스레드를 만들어 서로 경합하지 않도록 함
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
 from fastapi import FastAPI  # type: ignore
+from fastapi.responses import ORJSONResponse  # type: ignore
 import uvicorn  # type: ignore
-import os
 import sys
+import logging
 
 # UTF-8 인코딩 강제 설정
 sys.stdout.reconfigure(encoding='utf-8')
 sys.stderr.reconfigure(encoding='utf-8')
 
+# 로깅 설정 (학습/모델 로드 진행 상황은 "healthcare" 로거로 출력)
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    format="%(asctime)s [%(name)s] %(levelname)s %(message)s"
+)
+
 # healthcare_router import
-from healthcare_router import healthcare_router
+from healthcare_router import healthcare_router, lifespan
 
 # FastAPI 앱 생성
 app = FastAPI(
     title="Healthcare ML Service API",
     version="1.0.0",
-    description="건강 데이터 기반 진료과 및 병명 예측 ML 서비스"
+    description="건강 데이터 기반 진료과 및 병명 예측 ML 서비스",
+    lifespan=lifespan,  # 시작 시 모델 로드
+    default_response_class=ORJSONResponse  # orjson으로 JSON 직렬화
 )
 
 # 라우터 등록
@@ -37,5 +53,14 @@ async def root():
 if __name__ == "__main__":
     # 환경변수로 포트 설정 가능 (기본값: 9005)
     port = int(os.getenv("PORT", 9005))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # 워커 수는 WEB_CONCURRENCY로 조정 (워커마다 모델을 따로 로드하므로 기본 1)
+    # loop/http는 auto: uvloop/httptools가 설치되어 있으면 사용
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="auto",
+        http="auto"
+    )
 
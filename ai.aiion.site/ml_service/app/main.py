@@ -4,12 +4,26 @@ Titanic Service - FastAPI 애플리케이션
 
 import sys
 import os
+
+# BLAS/OpenMP 스레드 수 제한 (numpy/pandas/sklearn import 전에 설정해야 적용됨)
+# 워커 프로세스마다 코어 수만큼 스레드를 만들어 서로 경합하지 않도록 함
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
 from pathlib import Path
-from fastapi import FastAPI
-from fastapi.responses import RedirectResponse
+import orjson
+from fastapi import FastAPI, Request
+from fastapi.openapi.docs import (
+    get_redoc_html,
+    get_swagger_ui_html,
+    get_swagger_ui_oauth2_redirect_html,
+)
+from fastapi.responses import ORJSONResponse, RedirectResponse, Response
 
-# 공통 모듈 경로 추가
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# 공통 모듈 경로 추가 (이미 있으면 중복 추가하지 않음)
+_SERVICE_ROOT = str(Path(__file__).resolve().parent.parent)
+if _SERVICE_ROOT not in sys.path:
+    sys.path.insert(0, _SERVICE_ROOT)
 
 from app.config import (
     LoggingMiddleware,
@@ -24,6 +38,7 @@ from app.config import (
 from app.seoul_crime.seoul_router import router as seoul_crime_router
 from app.us_unemployment.router import router as us_unemployment_router
 from app.nlp_service.nlp_router import router as nlp_router
+from app.nlp_service.emma.emma_wordcloud import get_nlp_service
 
 # 로깅 설정
 logger = setup_logging(SERVICE_NAME, LOG_LEVEL, LOG_FORMAT)
@@ -31,14 +46,16 @@ logger = setup_logging(SERVICE_NAME, LOG_LEVEL, LOG_FORMAT)
 # FastAPI 앱 생성
 # root_path 설정: API Gateway를 통한 접근 시 경로 인식
 root_path = os.getenv("ROOT_PATH", "")
+OPENAPI_URL = f"{root_path}/openapi.json" if root_path else "/openapi.json"  # OpenAPI JSON 경로 (절대 경로)
 app = FastAPI(
     title="ML Service API",
     description="머신러닝 서비스 API 문서 (서울 범죄 데이터, 미국 실업률 데이터, NLTK 자연어 처리)",
     version=SERVICE_VERSION,
     root_path=root_path,  # API Gateway 경로 설정
-    docs_url="/docs",  # Swagger UI 경로 명시
-    redoc_url="/redoc",  # ReDoc 경로 명시
-    openapi_url=f"{root_path}/openapi.json" if root_path else "/openapi.json"  # OpenAPI JSON 경로 (절대 경로)
+    openapi_url=None,  # OpenAPI JSON/문서 라우트는 아래에서 직접 등록 (startup 시 미리 직렬화)
+    docs_url=None,
+    redoc_url=None,
+    default_response_class=ORJSONResponse  # orjson으로 JSON 직렬화
 )
 
 # API Gateway를 통한 접근 시 서버 URL 설정
@@ -63,6 +80,35 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+
+# OpenAPI 스키마는 startup 시 한 번 생성/직렬화해 두고 정적 바이트로 응답
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_json():
+    return Response(content=app.state.openapi_bytes, media_type="application/json")
+
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_ui_html(request: Request):
+    """Swagger UI"""
+    openapi_url = request.scope.get("root_path", "").rstrip("/") + OPENAPI_URL
+    return get_swagger_ui_html(
+        openapi_url=openapi_url,
+        title=f"{app.title} - Swagger UI",
+        oauth2_redirect_url="/docs/oauth2-redirect",
+    )
+
+
+@app.get("/docs/oauth2-redirect", include_in_schema=False)
+async def swagger_ui_redirect():
+    return get_swagger_ui_oauth2_redirect_html()
+
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc_html(request: Request):
+    """ReDoc"""
+    openapi_url = request.scope.get("root_path", "").rstrip("/") + OPENAPI_URL
+    return get_redoc_html(openapi_url=openapi_url, title=f"{app.title} - ReDoc")
+
 # CORS 설정 제거 - 게이트웨이가 모든 CORS를 처리하므로 백엔드 서비스에서는 제거
 # 프록시/파사드 패턴: 프론트엔드 -> 게이트웨이 -> 백엔드 서비스
 # 게이트웨이만 CORS를 처리하고, 백엔드 서비스는 게이트웨이를 통해서만 접근
@@ -89,6 +135,10 @@ async def root():
 @app.on_event("startup")
 async def startup_event():
     """서비스 시작 시 실행"""
+    # NLP 서비스 싱글톤 미리 생성 (NLTK 데이터 로드 비용을 첫 요청에서 제거)
+    get_nlp_service().warmup()
+    # 모든 라우터 등록 후 OpenAPI 스키마를 한 번만 생성하여 바이트로 고정
+    app.state.openapi_bytes = orjson.dumps(app.openapi())
     logger.info(f"{SERVICE_NAME} v{SERVICE_VERSION} started")
 
 
@@ -100,4 +150,14 @@ async def shutdown_event():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=PORT, root_path=root_path)
+    # 워커 수는 WEB_CONCURRENCY로 조정 (Text 객체 등 인메모리 상태가 워커별로 분리되므로 기본 1)
+    # loop/http는 auto: uvloop/httptools가 설치되어 있으면 사용
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=PORT,
+        root_path=root_path,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="auto",
+        http="auto"
+    )
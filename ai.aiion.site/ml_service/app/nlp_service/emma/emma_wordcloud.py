@@ -12,15 +12,15 @@ from pathlib import Path
 from typing import List, Dict, Optional, Tuple, Any, Callable
 from nltk.tokenize import sent_tokenize, word_tokenize, RegexpTokenizer
 from nltk.stem import PorterStemmer, LancasterStemmer, WordNetLemmatizer
-from nltk.tag import pos_tag, untag
+from nltk.tag import pos_tag, pos_tag_sents, untag
 from nltk import Text, FreqDist
 from nltk.corpus import gutenberg
 from wordcloud import WordCloud
 import io
-import base64
+import re
 import sys
 from io import StringIO
-from functools import wraps
+from functools import lru_cache, wraps
 
 try:
     from common.utils import setup_logging
@@ -30,6 +30,42 @@ except ImportError:
     logger = logging.getLogger("nlp_service")
 
 
+# 순수 함수 연산 캐시 크기 (단어 단위 / 텍스트 단위)
+WORD_CACHE_SIZE = 4096
+TEXT_CACHE_SIZE = 1024
+# 텍스트 단위 캐시에 넣을 최대 입력 길이 (문자 수)
+# 큰 요청 본문과 그 토큰 리스트가 캐시에 붙잡혀 메모리가 커지지 않도록 짧은 입력만 memoize
+TEXT_CACHE_MAX_CHARS = 4096
+
+
+@lru_cache(maxsize=128)
+def _compile(pattern: str) -> re.Pattern:
+    """정규식 컴파일 결과 캐시 (RegexpTokenizer와 동일한 플래그 사용)"""
+    return re.compile(pattern, re.UNICODE | re.MULTILINE | re.DOTALL)
+
+
+def _text_lru_cache(maxsize: int):
+    """
+    짧은 텍스트 입력만 캐시하는 lru_cache (첫 번째 인자가 텍스트)
+
+    TEXT_CACHE_MAX_CHARS보다 긴 입력은 캐시를 거치지 않고 바로 계산합니다.
+    cache_info/cache_clear는 내부 캐시의 것을 그대로 노출합니다.
+    """
+    def decorator(func: Callable):
+        cached = lru_cache(maxsize=maxsize)(func)
+
+        @wraps(func)
+        def wrapper(text: str, *args):
+            if len(text) > TEXT_CACHE_MAX_CHARS:
+                return func(text, *args)
+            return cached(text, *args)
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+    return decorator
+
+
 def safe_execute(default_return=None):
     """에러 처리를 위한 데코레이터"""
     def decorator(func: Callable):
@@ -50,6 +86,12 @@ class EmmaWordcloud:
     # 명사 품사 태그
     NOUN_TAGS = {"NN", "NNS", "NNP", "NNPS"}
     
+    # 시작 시 메모리에 올려둘 Gutenberg 말뭉치 (Emma 워드클라우드 등에서 사용)
+    PRELOAD_CORPORA = ("austen-emma.txt",)
+    
+    # 이름 추출 시 제외할 호칭
+    NAME_STOPWORDS = frozenset(["Mr.", "Mrs.", "Miss", "Mr", "Mrs", "Dear"])
+    
     def __init__(self):
         """NLTK 서비스 초기화"""
         self._download_nltk_data()
@@ -59,6 +101,38 @@ class EmmaWordcloud:
         self.regex_tokenizer = RegexpTokenizer("[\w]+")
         self.text_objects: Dict[str, Text] = {}
         self.corpus_data: Dict[str, str] = {}
+        self._init_caches()
+    
+    def _init_caches(self):
+        """동일 입력에 대해 항상 같은 결과를 내는 연산의 LRU 캐시 생성 (텍스트 단위는 짧은 입력만)"""
+        self._sent_tokenize_cached = _text_lru_cache(TEXT_CACHE_SIZE)(
+            lambda text: tuple(sent_tokenize(text))
+        )
+        self._word_tokenize_cached = _text_lru_cache(TEXT_CACHE_SIZE)(
+            lambda text: tuple(word_tokenize(text))
+        )
+        self._regex_tokenize_cached = _text_lru_cache(TEXT_CACHE_SIZE)(
+            lambda text, pattern: tuple(_compile(pattern).findall(text))
+        )
+        self._pos_tag_cached = _text_lru_cache(TEXT_CACHE_SIZE)(
+            lambda text: tuple(pos_tag(word_tokenize(text)))
+        )
+        self._stem_porter_cached = lru_cache(maxsize=WORD_CACHE_SIZE)(self.stemmer_porter.stem)
+        self._stem_lancaster_cached = lru_cache(maxsize=WORD_CACHE_SIZE)(self.stemmer_lancaster.stem)
+        self._lemmatize_cached = lru_cache(maxsize=WORD_CACHE_SIZE)(self.lemmatizer.lemmatize)
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """연산별 캐시 적중 통계 반환"""
+        caches = {
+            "tokenize_sentences": self._sent_tokenize_cached,
+            "tokenize_words": self._word_tokenize_cached,
+            "tokenize_regex": self._regex_tokenize_cached,
+            "pos_tag": self._pos_tag_cached,
+            "stem_porter": self._stem_porter_cached,
+            "stem_lancaster": self._stem_lancaster_cached,
+            "lemmatize": self._lemmatize_cached,
+        }
+        return {name: cache.cache_info()._asdict() for name, cache in caches.items()}
         
     def _download_nltk_data(self):
         """NLTK 데이터 다운로드"""
@@ -69,6 +143,27 @@ class EmmaWordcloud:
         except Exception as e:
             logger.warning(f"NLTK 데이터 다운로드 중 오류: {e}")
     
+    def warmup(self):
+        """
+        NLTK 지연 로딩 리소스를 미리 로드
+        
+        Punkt, WordNet, 품사 태거, Gutenberg 말뭉치는 처음 사용할 때 로드되므로
+        서비스 시작 시 한 번씩 호출하여 첫 요청의 지연을 없앱니다.
+        """
+        try:
+            sent_tokenize("Warm up. Loading punkt.")
+            tokens = word_tokenize("warmup running cats")
+            self.stemmer_porter.stem("running")
+            self.stemmer_lancaster.stem("running")
+            self.lemmatizer.lemmatize("cats")
+            pos_tag(tokens)
+            gutenberg.fileids()
+            for file_id in self.PRELOAD_CORPORA:
+                self.load_corpus("gutenberg", file_id)
+            logger.info("NLTK 리소스 사전 로드 완료")
+        except Exception as e:
+            logger.warning(f"NLTK 리소스 사전 로드 중 오류: {e}")
+    
     def _capture_stdout(self, func: Callable, *args, **kwargs) -> str:
         """stdout 캡처 헬퍼"""
         old_stdout = sys.stdout
@@ -79,15 +174,13 @@ class EmmaWordcloud:
         finally:
             sys.stdout = old_stdout
     
-    def _create_image_base64(self, figsize: Tuple[int, int] = (12, 6)) -> Optional[str]:
-        """matplotlib 이미지를 Base64로 변환"""
+    def _create_image_bytes(self, figsize: Tuple[int, int] = (12, 6)) -> Optional[bytes]:
+        """matplotlib 이미지를 PNG 바이트로 변환"""
         try:
             buf = io.BytesIO()
             plt.savefig(buf, format='png', bbox_inches='tight')
-            buf.seek(0)
-            img_base64 = base64.b64encode(buf.read()).decode('utf-8')
             plt.close()
-            return img_base64
+            return buf.getvalue()
         except Exception as e:
             logger.error(f"이미지 생성 실패: {e}")
             plt.close()
@@ -102,8 +195,10 @@ class EmmaWordcloud:
     
     @safe_execute()
     def load_corpus(self, corpus_name: str, file_id: Optional[str] = None) -> Optional[str]:
-        """말뭉치 데이터 로드"""
+        """말뭉치 데이터 로드 (한 번 로드한 말뭉치는 메모리에서 반환)"""
         if corpus_name == 'gutenberg' and file_id:
+            if file_id in self.corpus_data:
+                return self.corpus_data[file_id]
             raw_text = gutenberg.raw(file_id)
             self.corpus_data[file_id] = raw_text
             logger.info(f"말뭉치 로드 완료: {file_id}")
@@ -124,43 +219,70 @@ class EmmaWordcloud:
     @safe_execute(default_return=[])
     def tokenize_sentences(self, text: str) -> List[str]:
         """문장 단위 토큰화"""
-        return sent_tokenize(text)
+        return list(self._sent_tokenize_cached(text))
     
     @safe_execute(default_return=[])
     def tokenize_words(self, text: str) -> List[str]:
         """단어 단위 토큰화"""
-        return word_tokenize(text)
+        return list(self._word_tokenize_cached(text))
     
     @safe_execute(default_return=[])
     def tokenize_regex(self, text: str, pattern: str = "[\w]+") -> List[str]:
         """정규식 기반 토큰화"""
-        return RegexpTokenizer(pattern).tokenize(text)
+        return list(self._regex_tokenize_cached(text, pattern))
     
     # ========== 형태소 분석 ==========
     
+    @staticmethod
+    def _stem_words(stem: Callable[[str], str], words: List[str]) -> List[str]:
+        """고유 단어만 한 번씩 어간 추출한 뒤 원래 순서로 매핑"""
+        stems = {w: stem(w) for w in dict.fromkeys(words)}
+        return [stems[w] for w in words]
+    
     @safe_execute(default_return=[])
     def stem_porter(self, words: List[str]) -> List[str]:
         """Porter Stemmer 어간 추출"""
-        return [self.stemmer_porter.stem(w) for w in words]
+        return self._stem_words(self._stem_porter_cached, words)
+    
+    @safe_execute(default_return=[])
+    def stem_porter_batch(self, word_lists: List[List[str]]) -> List[List[str]]:
+        """Porter Stemmer 배치 어간 추출 (평탄화 후 한 번에 처리하고 다시 분할)"""
+        flat = self._stem_words(self._stem_porter_cached, [w for words in word_lists for w in words])
+        result, offset = [], 0
+        for words in word_lists:
+            result.append(flat[offset:offset + len(words)])
+            offset += len(words)
+        return result
     
     @safe_execute(default_return=[])
     def stem_lancaster(self, words: List[str]) -> List[str]:
         """Lancaster Stemmer 어간 추출"""
-        return [self.stemmer_lancaster.stem(w) for w in words]
+        return self._stem_words(self._stem_lancaster_cached, words)
     
     @safe_execute(default_return=[])
     def lemmatize(self, words: List[str], pos: Optional[str] = None) -> List[str]:
         """원형 복원"""
-        if pos:
-            return [self.lemmatizer.lemmatize(w, pos=pos) for w in words]
-        return [self.lemmatizer.lemmatize(w) for w in words]
+        lemmatize = self._lemmatize_cached
+        pos = pos or "n"  # WordNetLemmatizer 기본 품사
+        return [lemmatize(w, pos) for w in words]
+    
+    @safe_execute(default_return=[])
+    def lemmatize_batch(self, items: List[Tuple[List[str], Optional[str]]]) -> List[List[str]]:
+        """원형 복원 배치 처리 ((단어 리스트, 품사) 목록)"""
+        lemmatize = self._lemmatize_cached
+        return [[lemmatize(w, pos or "n") for w in words] for words, pos in items]
     
     # ========== 품사 태깅 ==========
     
     @safe_execute(default_return=[])
     def pos_tag_text(self, text: str) -> List[Tuple[str, str]]:
         """품사 태깅"""
-        return pos_tag(word_tokenize(text))
+        return list(self._pos_tag_cached(text))
+    
+    @safe_execute(default_return=[])
+    def pos_tag_batch(self, texts: List[str]) -> List[List[Tuple[str, str]]]:
+        """품사 태깅 배치 처리 (태거를 한 번만 호출)"""
+        return pos_tag_sents([word_tokenize(text) for text in texts])
     
     @safe_execute(default_return=[])
     def pos_tag_tokens(self, tokens: List[str]) -> List[Tuple[str, str]]:
@@ -208,8 +330,8 @@ class EmmaWordcloud:
         """저장된 Text 객체 조회"""
         return self.text_objects.get(name)
     
-    def plot_word_frequency(self, text_name: str, num_words: int = 20) -> Optional[str]:
-        """단어 빈도 그래프 생성 (Base64)"""
+    def plot_word_frequency(self, text_name: str, num_words: int = 20) -> Optional[bytes]:
+        """단어 빈도 그래프 생성 (PNG 바이트)"""
         text_obj = self.get_text_object(text_name)
         if not text_obj:
             logger.warning(f"Text 객체를 찾을 수 없습니다: {text_name}")
@@ -217,10 +339,10 @@ class EmmaWordcloud:
         
         plt.figure(figsize=(12, 6))
         text_obj.plot(num_words)
-        return self._create_image_base64()
+        return self._create_image_bytes()
     
-    def dispersion_plot(self, text_name: str, words: List[str]) -> Optional[str]:
-        """단어 분산 플롯 생성 (Base64)"""
+    def dispersion_plot(self, text_name: str, words: List[str]) -> Optional[bytes]:
+        """단어 분산 플롯 생성 (PNG 바이트)"""
         text_obj = self.get_text_object(text_name)
         if not text_obj:
             logger.warning(f"Text 객체를 찾을 수 없습니다: {text_name}")
@@ -228,7 +350,7 @@ class EmmaWordcloud:
         
         plt.figure(figsize=(12, 6))
         text_obj.dispersion_plot(words)
-        return self._create_image_base64()
+        return self._create_image_bytes()
     
     @safe_execute(default_return=[])
     def concordance(self, text_name: str, word: str, lines: int = 5) -> List[str]:
@@ -293,13 +415,12 @@ class EmmaWordcloud:
     @safe_execute(default_return=FreqDist([]))
     def extract_names_from_text(self, text: str, stopwords: Optional[List[str]] = None) -> FreqDist:
         """고유명사(이름) 추출 및 빈도 분포 생성"""
-        if stopwords is None:
-            stopwords = ["Mr.", "Mrs.", "Miss", "Mr", "Mrs", "Dear"]
+        stopword_set = self.NAME_STOPWORDS if stopwords is None else frozenset(stopwords)
         
         tokens = self.regex_tokenizer.tokenize(text)
         tagged = pos_tag(tokens)
-        names = [word for word, pos in tagged if pos == "NNP" and word not in stopwords]
-        return FreqDist(names)
+        # FreqDist(Counter)는 C 구현으로 집계하므로 중간 리스트 없이 바로 전달
+        return FreqDist(word for word, pos in tagged if pos == "NNP" and word not in stopword_set)
     
     # ========== 워드클라우드 ==========
     
@@ -312,8 +433,8 @@ class EmmaWordcloud:
         max_words: int = 200,
         save_path: Optional[Path] = None,
         font_path: Optional[str] = None
-    ) -> Optional[str]:
-        """워드클라우드 생성 (Base64)"""
+    ) -> Optional[bytes]:
+        """워드클라우드 생성 (PNG 바이트)"""
         try:
             word_freq = dict(freq_dist.most_common(max_words))
             wc_params = {
@@ -327,26 +448,21 @@ class EmmaWordcloud:
             wc = WordCloud(**wc_params)
             wc.generate_from_frequencies(word_freq)
             
+            # matplotlib 렌더링 없이 워드클라우드 이미지를 바로 PNG로 인코딩
             buf = io.BytesIO()
-            plt.figure(figsize=(width/100, height/100))
-            plt.imshow(wc, interpolation='bilinear')
-            plt.axis("off")
-            plt.savefig(buf, format='png', bbox_inches='tight', dpi=100)
-            buf.seek(0)
-            img_base64 = base64.b64encode(buf.read()).decode('utf-8')
+            wc.to_image().save(buf, format="PNG", optimize=False)
+            img_bytes = buf.getvalue()
             
             # 파일로 저장
             if save_path:
                 save_path.parent.mkdir(parents=True, exist_ok=True)
                 with open(save_path, 'wb') as f:
-                    f.write(base64.b64decode(img_base64))
+                    f.write(img_bytes)
                 logger.info(f"워드클라우드 저장 완료: {save_path}")
             
-            plt.close()
-            return img_base64
+            return img_bytes
         except Exception as e:
             logger.error(f"워드클라우드 생성 실패: {e}")
-            plt.close()
             return None
     
     def generate_wordcloud_from_text(
@@ -358,7 +474,7 @@ class EmmaWordcloud:
         max_words: int = 200,
         save_path: Optional[Path] = None,
         font_path: Optional[str] = None
-    ) -> Optional[str]:
+    ) -> Optional[bytes]:
         """텍스트에서 직접 워드클라우드 생성"""
         tokens = self.regex_tokenizer.tokenize(text)
         freq_dist = FreqDist(tokens)
@@ -463,7 +579,7 @@ def generate_emma_wordcloud(
     height: int = 600,
     background_color: str = "white",
     max_words: int = 200
-) -> Optional[str]:
+) -> Optional[bytes]:
     """
     Emma 텍스트로부터 워드클라우드 생성 및 저장
     불용어를 제거하여 주요 단어(특히 캐릭터 이름)가 더 크게 표시되도록 함
@@ -475,7 +591,7 @@ def generate_emma_wordcloud(
         max_words: 최대 단어 수
     
     Returns:
-        Base64 인코딩된 이미지 문자열
+        PNG 이미지 바이트
     """
     try:
         service = get_nlp_service()
@@ -499,7 +615,7 @@ def generate_emma_wordcloud(
         # 불용어 제거
         stopwords = load_english_stopwords()
         # 소문자로 변환하여 비교 (대소문자 구분 없이)
-        stopwords_lower = [sw.lower() for sw in stopwords]
+        stopwords_lower = {sw.lower() for sw in stopwords}
         
         # 불용어 제거 및 필터링 (최소 2글자 이상)
         filtered_tokens = [
@@ -540,7 +656,7 @@ def generate_emma_wordcloud(
                 text_list.extend([word] * freq)
             text_for_stylecloud = ' '.join(text_list)
             
-            # StyleCloud 생성 (임시 파일로 저장 후 Base64로 변환)
+            # StyleCloud 생성 (임시 파일로 저장 후 바이트로 읽기)
             temp_path = save_dir / "emma_wordcloud_temp.png"
             # stylecloud는 size를 단일 정수로 받음 (정사각형)
             size = max(width, height)
@@ -555,10 +671,9 @@ def generate_emma_wordcloud(
                 gradient='horizontal',  # 수평 그라데이션
             )
             
-            # 생성된 이미지를 읽어서 Base64로 변환
+            # 생성된 이미지 읽기
             with open(temp_path, 'rb') as f:
                 img_bytes = f.read()
-                img_base64 = base64.b64encode(img_bytes).decode('utf-8')
             
             # 최종 저장 경로로 복사
             with open(save_path, 'wb') as f:
@@ -573,7 +688,7 @@ def generate_emma_wordcloud(
             top_words = freq_dist.most_common(20)
             logger.info(f"상위 20개 단어: {top_words}")
             
-            return img_base64
+            return img_bytes
             
         except ImportError:
             logger.warning("stylecloud를 사용할 수 없습니다. 기본 wordcloud로 대체합니다.")
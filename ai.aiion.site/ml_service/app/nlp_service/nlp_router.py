@@ -3,15 +3,20 @@ NLP Router - FastAPI 라우터
 NLTK 자연어 처리 관련 엔드포인트를 정의
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import JSONResponse, Response
-from typing import List, Dict, Optional, Any
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
+from typing import List, Optional
 from pydantic import BaseModel
-import base64
+from functools import wraps
+import hashlib
+import logging
+from pathlib import Path
 
 from app.nlp_service.emma.emma_wordcloud import get_nlp_service, generate_emma_wordcloud
 from app.nlp_service.sansung.sangsung_wordcloud import SangsungWordcloud
 
+logger = logging.getLogger("nlp_service")
+
 # 라우터 생성
 router = APIRouter(
     prefix="/nlp",
@@ -20,6 +25,29 @@ router = APIRouter(
 )
 
 
+def handle_errors(code: str):
+    """
+    라우트 공통 예외 처리 데코레이터
+    
+    HTTPException은 그대로 전달하고, 그 외 예외는 한 줄 경고 로그를 남긴 뒤 500 응답으로 변환
+    (스택 트레이스는 DEBUG 레벨에서만 출력)
+    detail은 {"code": <오류 코드>, "error": <예외 메시지>} 형식 (메시지 현지화는 프론트엔드에서 처리)
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.warning("%s: %s", code, e)
+                logger.debug(code, exc_info=True)
+                raise HTTPException(status_code=500, detail={"code": code, "error": str(e)})
+        return wrapper
+    return decorator
+
+
 # ========== 요청/응답 모델 ==========
 
 class TextRequest(BaseModel):
@@ -45,6 +73,21 @@ class LemmatizeRequest(BaseModel):
     pos: Optional[str] = None
 
 
+class BatchStemRequest(BaseModel):
+    """배치 어간 추출 요청 모델"""
+    items: List[StemRequest]
+
+
+class BatchLemmatizeRequest(BaseModel):
+    """배치 원형 복원 요청 모델"""
+    items: List[LemmatizeRequest]
+
+
+class BatchTextRequest(BaseModel):
+    """배치 텍스트 처리 요청 모델"""
+    items: List[TextRequest]
+
+
 class WordCloudRequest(BaseModel):
     """워드클라우드 생성 요청 모델"""
     text: Optional[str] = None
@@ -74,438 +117,450 @@ async def root():
     }
 
 
+@router.get("/cache/stats")
+@handle_errors("CACHE_STATS_FAILED")
+async def get_cache_stats():
+    """NLP 연산 캐시 적중 통계 조회"""
+    service = get_nlp_service()
+    return {"caches": service.get_cache_stats()}
+
+
 # ========== 말뭉치 관련 엔드포인트 ==========
 
 @router.get("/corpus/gutenberg")
+@handle_errors("CORPUS_LIST_FAILED")
 async def get_gutenberg_fileids():
     """Gutenberg 말뭉치 파일 목록 조회"""
-    try:
-        service = get_nlp_service()
-        fileids = service.get_gutenberg_fileids()
-        return {
-            "corpus": "gutenberg",
-            "fileids": fileids,
-            "count": len(fileids)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"말뭉치 목록 조회 실패: {str(e)}")
+    service = get_nlp_service()
+    fileids = service.get_gutenberg_fileids()
+    return {
+        "corpus": "gutenberg",
+        "fileids": fileids,
+        "count": len(fileids)
+    }
+
+
+# Gutenberg 말뭉치는 변하지 않으므로 브라우저/CDN 캐시를 길게 허용
+CORPUS_CACHE_CONTROL = "public, max-age=86400"
 
 
 @router.get("/corpus/gutenberg/{file_id}")
+@handle_errors("CORPUS_LOAD_FAILED")
 async def load_gutenberg_corpus(
+    request: Request,
+    response: Response,
     file_id: str,
     start: int = Query(0, ge=0),
     end: Optional[int] = Query(None, ge=0)
 ):
     """Gutenberg 말뭉치 로드"""
-    try:
-        service = get_nlp_service()
-        text = service.load_corpus("gutenberg", file_id)
-        
-        if text is None:
-            raise HTTPException(status_code=404, detail=f"말뭉치를 찾을 수 없습니다: {file_id}")
-        
-        # 텍스트 일부 반환
-        if end:
-            text = text[start:end]
-        else:
-            text = text[start:]
-        
-        return {
-            "file_id": file_id,
-            "text": text,
-            "length": len(text),
-            "preview": text[:500] if len(text) > 500 else text
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"말뭉치 로드 실패: {str(e)}")
+    # 같은 파일/구간이면 응답이 동일하므로 클라이언트 캐시가 유효하면 본문 생략
+    etag = '"' + hashlib.blake2b(f"{file_id}:{start}:{end}".encode(), digest_size=8).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CORPUS_CACHE_CONTROL})
+    
+    service = get_nlp_service()
+    text = service.load_corpus("gutenberg", file_id)
+    
+    if text is None:
+        raise HTTPException(status_code=404, detail=f"말뭉치를 찾을 수 없습니다: {file_id}")
+    
+    # 텍스트 일부 반환
+    if end:
+        text = text[start:end]
+    else:
+        text = text[start:]
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CORPUS_CACHE_CONTROL
+    return {
+        "file_id": file_id,
+        "text": text,
+        "length": len(text),
+        "preview": text[:500] if len(text) > 500 else text
+    }
 
 
 # ========== 토큰화 엔드포인트 ==========
 
 @router.post("/tokenize/sentences")
+@handle_errors("SENT_TOKENIZE_FAILED")
 async def tokenize_sentences(request: TextRequest):
     """문장 단위 토큰화"""
-    try:
-        service = get_nlp_service()
-        sentences = service.tokenize_sentences(request.text)
-        return {
-            "text": request.text,
-            "sentences": sentences,
-            "count": len(sentences)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"문장 토큰화 실패: {str(e)}")
+    service = get_nlp_service()
+    sentences = service.tokenize_sentences(request.text)
+    return {
+        "text": request.text,
+        "sentences": sentences,
+        "count": len(sentences)
+    }
 
 
 @router.post("/tokenize/words")
+@handle_errors("WORD_TOKENIZE_FAILED")
 async def tokenize_words(request: TextRequest):
     """단어 단위 토큰화"""
-    try:
-        service = get_nlp_service()
-        words = service.tokenize_words(request.text)
-        return {
-            "text": request.text,
-            "words": words,
-            "count": len(words)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"단어 토큰화 실패: {str(e)}")
+    service = get_nlp_service()
+    words = service.tokenize_words(request.text)
+    return {
+        "text": request.text,
+        "words": words,
+        "count": len(words)
+    }
 
 
 @router.post("/tokenize/regex")
+@handle_errors("REGEX_TOKENIZE_FAILED")
 async def tokenize_regex(request: TokenizeRequest):
     """정규식 기반 토큰화"""
-    try:
-        service = get_nlp_service()
-        tokens = service.tokenize_regex(request.text, request.pattern)
-        return {
-            "text": request.text,
-            "pattern": request.pattern,
-            "tokens": tokens,
-            "count": len(tokens)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"정규식 토큰화 실패: {str(e)}")
+    service = get_nlp_service()
+    tokens = service.tokenize_regex(request.text, request.pattern)
+    return {
+        "text": request.text,
+        "pattern": request.pattern,
+        "tokens": tokens,
+        "count": len(tokens)
+    }
 
 
 # ========== 형태소 분석 엔드포인트 ==========
 
 @router.post("/stem/porter")
+@handle_errors("STEM_FAILED")
 async def stem_porter(request: StemRequest):
     """Porter Stemmer를 사용한 어간 추출"""
-    try:
-        service = get_nlp_service()
-        stemmed = service.stem_porter(request.words)
-        return {
-            "words": request.words,
-            "stemmed": stemmed,
-            "method": "Porter Stemmer"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"어간 추출 실패: {str(e)}")
+    service = get_nlp_service()
+    stemmed = service.stem_porter(request.words)
+    return {
+        "words": request.words,
+        "stemmed": stemmed,
+        "method": "Porter Stemmer"
+    }
+
+
+@router.post("/stem/porter/batch")
+@handle_errors("BATCH_STEM_FAILED")
+async def stem_porter_batch(request: BatchStemRequest):
+    """Porter Stemmer를 사용한 배치 어간 추출"""
+    service = get_nlp_service()
+    stemmed = service.stem_porter_batch([item.words for item in request.items])
+    return {
+        "results": [
+            {"words": item.words, "stemmed": result}
+            for item, result in zip(request.items, stemmed)
+        ],
+        "count": len(stemmed),
+        "method": "Porter Stemmer"
+    }
 
 
 @router.post("/stem/lancaster")
+@handle_errors("STEM_FAILED")
 async def stem_lancaster(request: StemRequest):
     """Lancaster Stemmer를 사용한 어간 추출"""
-    try:
-        service = get_nlp_service()
-        stemmed = service.stem_lancaster(request.words)
-        return {
-            "words": request.words,
-            "stemmed": stemmed,
-            "method": "Lancaster Stemmer"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"어간 추출 실패: {str(e)}")
+    service = get_nlp_service()
+    stemmed = service.stem_lancaster(request.words)
+    return {
+        "words": request.words,
+        "stemmed": stemmed,
+        "method": "Lancaster Stemmer"
+    }
 
 
 @router.post("/lemmatize")
+@handle_errors("LEMMATIZE_FAILED")
 async def lemmatize(request: LemmatizeRequest):
     """원형 복원 (Lemmatization)"""
-    try:
-        service = get_nlp_service()
-        lemmatized = service.lemmatize(request.words, request.pos)
-        return {
-            "words": request.words,
-            "lemmatized": lemmatized,
-            "pos": request.pos
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"원형 복원 실패: {str(e)}")
+    service = get_nlp_service()
+    lemmatized = service.lemmatize(request.words, request.pos)
+    return {
+        "words": request.words,
+        "lemmatized": lemmatized,
+        "pos": request.pos
+    }
+
+
+@router.post("/lemmatize/batch")
+@handle_errors("BATCH_LEMMATIZE_FAILED")
+async def lemmatize_batch(request: BatchLemmatizeRequest):
+    """배치 원형 복원 (Lemmatization)"""
+    service = get_nlp_service()
+    lemmatized = service.lemmatize_batch([(item.words, item.pos) for item in request.items])
+    return {
+        "results": [
+            {"words": item.words, "lemmatized": result, "pos": item.pos}
+            for item, result in zip(request.items, lemmatized)
+        ],
+        "count": len(lemmatized)
+    }
 
 
 # ========== 품사 태깅 엔드포인트 ==========
 
 @router.post("/pos-tag")
+@handle_errors("POS_TAG_FAILED")
 async def pos_tag_text(request: TextRequest):
     """품사 태깅"""
-    try:
-        service = get_nlp_service()
-        tagged = service.pos_tag_text(request.text)
-        return {
-            "text": request.text,
-            "tagged": [{"word": word, "pos": pos} for word, pos in tagged],
-            "count": len(tagged)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"품사 태깅 실패: {str(e)}")
+    service = get_nlp_service()
+    tagged = service.pos_tag_text(request.text)
+    return {
+        "text": request.text,
+        "tagged": [{"word": word, "pos": pos} for word, pos in tagged],
+        "count": len(tagged)
+    }
+
+
+@router.post("/pos-tag/batch")
+@handle_errors("BATCH_POS_TAG_FAILED")
+async def pos_tag_batch(request: BatchTextRequest):
+    """배치 품사 태깅"""
+    service = get_nlp_service()
+    tagged_list = service.pos_tag_batch([item.text for item in request.items])
+    return {
+        "results": [
+            {
+                "text": item.text,
+                "tagged": [{"word": word, "pos": pos} for word, pos in tagged],
+                "count": len(tagged)
+            }
+            for item, tagged in zip(request.items, tagged_list)
+        ],
+        "count": len(tagged_list)
+    }
 
 
 @router.post("/pos-tag/extract-nouns")
+@handle_errors("NOUN_EXTRACT_FAILED")
 async def extract_nouns(request: TextRequest):
     """명사만 추출"""
-    try:
-        service = get_nlp_service()
-        nouns = service.extract_nouns(request.text)
-        return {
-            "text": request.text,
-            "nouns": nouns,
-            "count": len(nouns)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"명사 추출 실패: {str(e)}")
+    service = get_nlp_service()
+    nouns = service.extract_nouns(request.text)
+    return {
+        "text": request.text,
+        "nouns": nouns,
+        "count": len(nouns)
+    }
 
 
 @router.post("/pos-tag/pos-tokens")
+@handle_errors("POS_TOKENS_FAILED")
 async def create_pos_tokens(request: TextRequest):
     """품사 정보를 포함한 토큰 생성"""
-    try:
-        service = get_nlp_service()
-        pos_tokens = service.create_pos_tokenizer(request.text)
-        return {
-            "text": request.text,
-            "pos_tokens": pos_tokens,
-            "count": len(pos_tokens)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"POS 토큰 생성 실패: {str(e)}")
+    service = get_nlp_service()
+    pos_tokens = service.create_pos_tokenizer(request.text)
+    return {
+        "text": request.text,
+        "pos_tokens": pos_tokens,
+        "count": len(pos_tokens)
+    }
 
 
 @router.get("/pos-tag/help/{tag}")
+@handle_errors("POS_HELP_FAILED")
 async def get_pos_help(tag: str):
     """품사 태그 설명 조회"""
-    try:
-        service = get_nlp_service()
-        help_text = service.get_pos_help(tag)
-        return {
-            "tag": tag,
-            "help": help_text
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"품사 태그 설명 조회 실패: {str(e)}")
+    service = get_nlp_service()
+    help_text = service.get_pos_help(tag)
+    return {
+        "tag": tag,
+        "help": help_text
+    }
 
 
 # ========== Text 객체 관련 엔드포인트 ==========
 
 @router.post("/text/create")
+@handle_errors("TEXT_OBJECT_FAILED")
 async def create_text_object(request: TextRequest):
     """Text 객체 생성"""
-    try:
-        service = get_nlp_service()
-        text_obj = service.create_text_object(request.text, request.name)
-        
-        if text_obj is None:
-            raise HTTPException(status_code=500, detail="Text 객체 생성 실패")
-        
-        return {
-            "name": request.name,
-            "text_length": len(request.text),
-            "message": f"Text 객체 '{request.name}' 생성 완료"
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Text 객체 생성 실패: {str(e)}")
+    service = get_nlp_service()
+    text_obj = service.create_text_object(request.text, request.name)
+    
+    if text_obj is None:
+        raise HTTPException(status_code=500, detail="Text 객체 생성 실패")
+    
+    return {
+        "name": request.name,
+        "text_length": len(request.text),
+        "message": f"Text 객체 '{request.name}' 생성 완료"
+    }
 
 
 @router.get("/text/{name}/concordance")
+@handle_errors("CONCORDANCE_FAILED")
 async def get_concordance(
     name: str,
     word: str = Query(..., description="검색할 단어"),
     lines: int = Query(5, ge=1, le=50, description="반환할 라인 수")
 ):
     """단어가 사용된 문맥 조회"""
-    try:
-        service = get_nlp_service()
-        concordance = service.concordance(name, word, lines)
-        return {
-            "text_name": name,
-            "word": word,
-            "concordance": concordance,
-            "count": len(concordance)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Concordance 조회 실패: {str(e)}")
+    service = get_nlp_service()
+    concordance = service.concordance(name, word, lines)
+    return {
+        "text_name": name,
+        "word": word,
+        "concordance": concordance,
+        "count": len(concordance)
+    }
 
 
 @router.get("/text/{name}/similar")
+@handle_errors("SIMILAR_WORDS_FAILED")
 async def get_similar_words(
     name: str,
     word: str = Query(..., description="검색할 단어"),
     num: int = Query(10, ge=1, le=50, description="반환할 단어 수")
 ):
     """유사한 문맥에서 사용된 단어 찾기"""
-    try:
-        service = get_nlp_service()
-        similar = service.find_similar_words(name, word, num)
-        return {
-            "text_name": name,
-            "word": word,
-            "similar_words": similar,
-            "count": len(similar)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"유사 단어 검색 실패: {str(e)}")
+    service = get_nlp_service()
+    similar = service.find_similar_words(name, word, num)
+    return {
+        "text_name": name,
+        "word": word,
+        "similar_words": similar,
+        "count": len(similar)
+    }
 
 
 @router.get("/text/{name}/collocations")
+@handle_errors("COLLOCATIONS_FAILED")
 async def get_collocations(
     name: str,
     num: int = Query(10, ge=1, le=50, description="반환할 연어 수")
 ):
     """연어(collocation) 찾기"""
-    try:
-        service = get_nlp_service()
-        collocations = service.find_collocations(name, num)
-        return {
-            "text_name": name,
-            "collocations": [{"word1": w1, "word2": w2} for w1, w2 in collocations],
-            "count": len(collocations)
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"연어 검색 실패: {str(e)}")
+    service = get_nlp_service()
+    collocations = service.find_collocations(name, num)
+    return {
+        "text_name": name,
+        "collocations": [{"word1": w1, "word2": w2} for w1, w2 in collocations],
+        "count": len(collocations)
+    }
 
 
 @router.get("/text/{name}/plot")
+@handle_errors("PLOT_FAILED")
 async def plot_word_frequency(
     name: str,
     num_words: int = Query(20, ge=1, le=100, description="표시할 단어 수")
 ):
     """단어 빈도 그래프 생성 (PNG 이미지 반환)"""
-    try:
-        service = get_nlp_service()
-        img_base64 = service.plot_word_frequency(name, num_words)
-        
-        if img_base64 is None:
-            raise HTTPException(status_code=404, detail=f"Text 객체를 찾을 수 없습니다: {name}")
-        
-        # Base64 디코딩하여 PNG 이미지 반환
-        img_bytes = base64.b64decode(img_base64)
-        return Response(content=img_bytes, media_type="image/png")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"그래프 생성 실패: {str(e)}")
+    service = get_nlp_service()
+    img_bytes = service.plot_word_frequency(name, num_words)
+    
+    if img_bytes is None:
+        raise HTTPException(status_code=404, detail=f"Text 객체를 찾을 수 없습니다: {name}")
+    
+    return Response(content=img_bytes, media_type="image/png")
 
 
 @router.post("/text/{name}/dispersion-plot")
+@handle_errors("DISPERSION_PLOT_FAILED")
 async def dispersion_plot(
     name: str,
     words: List[str] = Query(..., description="검색할 단어 리스트")
 ):
     """단어 분산 플롯 생성 (PNG 이미지 반환)"""
-    try:
-        service = get_nlp_service()
-        img_base64 = service.dispersion_plot(name, words)
-        
-        if img_base64 is None:
-            raise HTTPException(status_code=404, detail=f"Text 객체를 찾을 수 없습니다: {name}")
-        
-        # Base64 디코딩하여 PNG 이미지 반환
-        img_bytes = base64.b64decode(img_base64)
-        return Response(content=img_bytes, media_type="image/png")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"분산 플롯 생성 실패: {str(e)}")
+    service = get_nlp_service()
+    img_bytes = service.dispersion_plot(name, words)
+    
+    if img_bytes is None:
+        raise HTTPException(status_code=404, detail=f"Text 객체를 찾을 수 없습니다: {name}")
+    
+    return Response(content=img_bytes, media_type="image/png")
 
 
 # ========== 빈도 분포 엔드포인트 ==========
 
 @router.post("/freq-dist")
+@handle_errors("FREQ_DIST_FAILED")
 async def create_freq_dist(tokens: List[str]):
     """빈도 분포 생성"""
-    try:
-        service = get_nlp_service()
-        freq_dist = service.create_freq_dist(tokens)
-        stats = service.get_freq_stats(freq_dist)
-        return {
-            "tokens": tokens[:10],  # 처음 10개만 반환
-            "total_tokens": len(tokens),
-            "statistics": stats
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"빈도 분포 생성 실패: {str(e)}")
+    service = get_nlp_service()
+    freq_dist = service.create_freq_dist(tokens)
+    stats = service.get_freq_stats(freq_dist)
+    return {
+        "tokens": tokens[:10],  # 처음 10개만 반환
+        "total_tokens": len(tokens),
+        "statistics": stats
+    }
 
 
 @router.post("/freq-dist/extract-names")
+@handle_errors("NAME_EXTRACT_FAILED")
 async def extract_names(request: TextRequest):
     """텍스트에서 고유명사(이름) 추출 및 빈도 분포 생성"""
-    try:
-        service = get_nlp_service()
-        freq_dist = service.extract_names_from_text(request.text)
-        stats = service.get_freq_stats(freq_dist)
-        return {
-            "text": request.text,
-            "statistics": stats
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"이름 추출 실패: {str(e)}")
+    service = get_nlp_service()
+    freq_dist = service.extract_names_from_text(request.text)
+    stats = service.get_freq_stats(freq_dist)
+    return {
+        "text": request.text,
+        "statistics": stats
+    }
 
 
 # ========== 워드클라우드 엔드포인트 ==========
 
 @router.post("/wordcloud")
+@handle_errors("WORDCLOUD_FAILED")
 async def generate_wordcloud(request: WordCloudRequest):
     """워드클라우드 생성 (PNG 이미지 반환)"""
-    try:
-        service = get_nlp_service()
-        
-        if request.text:
-            # 텍스트에서 직접 생성
-            img_base64 = service.generate_wordcloud_from_text(
-                request.text,
-                request.width,
-                request.height,
-                request.background_color,
-                request.max_words
-            )
-        elif request.tokens:
-            # 토큰 리스트에서 생성
-            freq_dist = service.create_freq_dist(request.tokens)
-            img_base64 = service.generate_wordcloud(
-                freq_dist,
-                request.width,
-                request.height,
-                request.background_color,
-                request.max_words
-            )
-        else:
-            raise HTTPException(status_code=400, detail="text 또는 tokens 중 하나는 필수입니다.")
-        
-        if img_base64 is None:
-            raise HTTPException(status_code=500, detail="워드클라우드 생성 실패")
-        
-        # Base64 디코딩하여 PNG 이미지 반환
-        img_bytes = base64.b64decode(img_base64)
-        return Response(content=img_bytes, media_type="image/png")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"워드클라우드 생성 실패: {str(e)}")
+    service = get_nlp_service()
+    
+    if request.text:
+        # 텍스트에서 직접 생성
+        img_bytes = service.generate_wordcloud_from_text(
+            request.text,
+            request.width,
+            request.height,
+            request.background_color,
+            request.max_words
+        )
+    elif request.tokens:
+        # 토큰 리스트에서 생성
+        freq_dist = service.create_freq_dist(request.tokens)
+        img_bytes = service.generate_wordcloud(
+            freq_dist,
+            request.width,
+            request.height,
+            request.background_color,
+            request.max_words
+        )
+    else:
+        raise HTTPException(status_code=400, detail="text 또는 tokens 중 하나는 필수입니다.")
+    
+    if img_bytes is None:
+        raise HTTPException(status_code=500, detail="워드클라우드 생성 실패")
+    
+    return Response(content=img_bytes, media_type="image/png")
 
 
 # ========== 통합 분석 엔드포인트 ==========
 
 @router.post("/analyze")
+@handle_errors("TEXT_ANALYSIS_FAILED")
 async def analyze_text(
     request: TextRequest,
     include_wordcloud: bool = Query(False, description="워드클라우드 포함 여부")
 ):
     """텍스트 종합 분석"""
-    try:
-        service = get_nlp_service()
-        result = service.analyze_text(request.text, request.name, include_wordcloud)
-        
-        # Base64 이미지는 JSON 응답에서 제외 (별도 엔드포인트 사용 권장)
-        if "wordcloud_image" in result:
-            result["wordcloud_available"] = True
-            # 실제 이미지 데이터는 제거하고 플래그만 반환
-            del result["wordcloud_image"]
-            result["message"] = "워드클라우드는 /wordcloud 엔드포인트를 사용하세요."
-        
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"텍스트 분석 실패: {str(e)}")
+    service = get_nlp_service()
+    result = service.analyze_text(request.text, request.name, include_wordcloud)
+    
+    # 이미지 바이트는 JSON 응답에서 제외 (별도 엔드포인트 사용 권장)
+    if "wordcloud_image" in result:
+        result["wordcloud_available"] = True
+        # 실제 이미지 데이터는 제거하고 플래그만 반환
+        del result["wordcloud_image"]
+        result["message"] = "워드클라우드는 /wordcloud 엔드포인트를 사용하세요."
+    
+    return result
 
 
 # ========== Emma 워드클라우드 엔드포인트 ==========
 
 @router.get("/emma")
+@handle_errors("EMMA_WORDCLOUD_FAILED")
 async def get_emma(
     width: int = Query(1000, ge=100, le=2000, description="이미지 너비"),
     height: int = Query(600, ge=100, le=2000, description="이미지 높이"),
@@ -513,43 +568,26 @@ async def get_emma(
     max_words: int = Query(200, ge=10, le=500, description="최대 단어 수")
 ):
     """Emma 텍스트 워드클라우드 생성 (PNG 이미지 반환)"""
-    import traceback
-    try:
-        img_base64 = generate_emma_wordcloud(
-            width=width,
-            height=height,
-            background_color=background_color,
-            max_words=max_words
-        )
-        
-        if img_base64 is None:
-            raise HTTPException(
-                status_code=500, 
-                detail="Emma 워드클라우드 생성 실패: 함수가 None을 반환했습니다. 로그를 확인하세요."
-            )
-        
-        # Base64 디코딩하여 PNG 이미지 반환
-        try:
-            img_bytes = base64.b64decode(img_base64)
-            return Response(content=img_bytes, media_type="image/png")
-        except Exception as decode_error:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Base64 디코딩 실패: {str(decode_error)}"
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        error_trace = traceback.format_exc()
+    img_bytes = generate_emma_wordcloud(
+        width=width,
+        height=height,
+        background_color=background_color,
+        max_words=max_words
+    )
+    
+    if img_bytes is None:
         raise HTTPException(
             status_code=500, 
-            detail=f"Emma 워드클라우드 생성 실패: {str(e)}\n\n{error_trace}"
+            detail="Emma 워드클라우드 생성 실패: 함수가 None을 반환했습니다. 로그를 확인하세요."
         )
+    
+    return Response(content=img_bytes, media_type="image/png")
 
 
 # ========== Samsung 워드클라우드 엔드포인트 ==========
 
 @router.get("/samsung")
+@handle_errors("SAMSUNG_WORDCLOUD_FAILED")
 async def get_samsung_wordcloud(
     width: int = Query(1000, ge=100, le=2000, description="이미지 너비"),
     height: int = Query(600, ge=100, le=2000, description="이미지 높이"),
@@ -557,43 +595,26 @@ async def get_samsung_wordcloud(
     max_words: int = Query(200, ge=10, le=500, description="최대 단어 수")
 ):
     """삼성전자 지속가능경영보고서 워드클라우드 생성 (PNG 이미지 반환)"""
-    import traceback
-    try:
-        img_base64 = generate_samsung_wordcloud(
-            width=width,
-            height=height,
-            background_color=background_color,
-            max_words=max_words
-        )
-        
-        if img_base64 is None:
-            raise HTTPException(
-                status_code=500, 
-                detail="Samsung 워드클라우드 생성 실패: 함수가 None을 반환했습니다. 로그를 확인하세요."
-            )
-        
-        # Base64 디코딩하여 PNG 이미지 반환
-        try:
-            img_bytes = base64.b64decode(img_base64)
-            return Response(content=img_bytes, media_type="image/png")
-        except Exception as decode_error:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Base64 디코딩 실패: {str(decode_error)}"
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        error_trace = traceback.format_exc()
+    img_bytes = generate_samsung_wordcloud(
+        width=width,
+        height=height,
+        background_color=background_color,
+        max_words=max_words
+    )
+    
+    if img_bytes is None:
         raise HTTPException(
             status_code=500, 
-            detail=f"Samsung 워드클라우드 생성 실패: {str(e)}\n\n{error_trace}"
+            detail="Samsung 워드클라우드 생성 실패: 함수가 None을 반환했습니다. 로그를 확인하세요."
         )
+    
+    return Response(content=img_bytes, media_type="image/png")
 
 
 # ========== Samsung 텍스트 처리 엔드포인트 ==========
 
 @router.post("/samsung/process")
+@handle_errors("SAMSUNG_PROCESS_FAILED")
 async def process_samsung_text():
     """삼성전자 지속가능경영보고서 텍스트 처리 및 워드클라우드 생성
     
@@ -605,40 +626,28 @@ async def process_samsung_text():
     5. 빈도 분석
     6. 워드클라우드 생성 및 저장 (save/samsung_wordcloud.png)
     """
-    import traceback
-    try:
-        # SangsungWordcloud 인스턴스 생성
-        wordcloud_service = SangsungWordcloud()
-        
-        # text_process 메서드 실행 (전체 프로세스: 빈도 분석 + 워드클라우드 생성)
-        result = wordcloud_service.text_process()
-        
-        # 워드클라우드 이미지 파일 경로
-        from pathlib import Path
-        save_path = Path(__file__).parent.parent / 'save' / 'samsung_wordcloud.png'
-        
-        # 빈도 데이터 처리 (pandas Series를 dict로 변환)
-        freq_txt = result.get('freq_txt', {})
-        if hasattr(freq_txt, 'to_dict'):
-            freq_dict = freq_txt.to_dict()
-        else:
-            freq_dict = str(freq_txt)
-        
-        return {
-            "status": "success",
-            "message": "텍스트 처리 및 워드클라우드 생성 완료",
-            "전처리결과": result.get('전처리결과', '완료'),
-            "freq_txt": freq_dict,
-            "freq_top_30": dict(list(freq_dict.items())[:30]) if isinstance(freq_dict, dict) else freq_dict,
-            "wordcloud_path": str(save_path),
-            "wordcloud_exists": save_path.exists()
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        error_trace = traceback.format_exc()
-        raise HTTPException(
-            status_code=500, 
-            detail=f"삼성전자 텍스트 처리 실패: {str(e)}\n\n{error_trace}"
-        )
-
+    # SangsungWordcloud 인스턴스 생성
+    wordcloud_service = SangsungWordcloud()
+    
+    # text_process 메서드 실행 (전체 프로세스: 빈도 분석 + 워드클라우드 생성)
+    result = wordcloud_service.text_process()
+    
+    # 워드클라우드 이미지 파일 경로
+    save_path = Path(__file__).parent.parent / 'save' / 'samsung_wordcloud.png'
+    
+    # 빈도 데이터 처리 (pandas Series를 dict로 변환)
+    freq_txt = result.get('freq_txt', {})
+    if hasattr(freq_txt, 'to_dict'):
+        freq_dict = freq_txt.to_dict()
+    else:
+        freq_dict = str(freq_txt)
+    
+    return {
+        "status": "success",
+        "message": "텍스트 처리 및 워드클라우드 생성 완료",
+        "전처리결과": result.get('전처리결과', '완료'),
+        "freq_txt": freq_dict,
+        "freq_top_30": dict(list(freq_dict.items())[:30]) if isinstance(freq_dict, dict) else freq_dict,
+        "wordcloud_path": str(save_path),
+        "wordcloud_exists": save_path.exists()
+    }
\ No newline at end of file
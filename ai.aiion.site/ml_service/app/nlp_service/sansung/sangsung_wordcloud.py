@@ -1,19 +1,13 @@
 import re
-import nltk
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any, Callable
+from typing import Optional
 # NLTK는 FreqDist만 사용 (punkt_tab 리소스 불필요)
 from nltk import FreqDist
 from wordcloud import WordCloud
-import io
-import base64
-import sys
-from io import StringIO
-from functools import wraps
 from konlpy.tag import Okt
 
 try:
@@ -24,12 +18,26 @@ except ImportError:
     logger = logging.getLogger("nlp_service")
 
 
+# Okt 싱글톤 (JVM 기동 및 형태소 분석기 초기화는 프로세스당 한 번만)
+_okt_instance: Optional[Okt] = None
+
+
+def get_okt() -> Okt:
+    """Okt 싱글톤 인스턴스 반환"""
+    global _okt_instance
+    if _okt_instance is None:
+        _okt_instance = Okt()
+        # Okt 초기화 (첫 호출 시 사전 로딩)
+        _okt_instance.pos("삼성전자 글로벌센터 전자사업부", stem=True)
+    return _okt_instance
+
+
 class SangsungWordcloud:
     """삼성전자 지속가능경영보고서 한국어 자연어 처리 및 워드클라우드 생성 클래스"""
 
     def __init__(self):
         """서비스 초기화"""
-        self.okt = Okt()
+        self.okt = get_okt()
         # 절대 경로 설정
         self.base_dir = Path(__file__).parent.parent
         self.data_dir = self.base_dir / 'data'
@@ -41,9 +49,6 @@ class SangsungWordcloud:
     def read_file(self):
         """파일 읽기"""
         try:
-            # Okt 초기화 (한 번만 실행)
-            self.okt.pos("삼성전자 글로벌센터 전자사업부", stem=True)
-            
             # 절대 경로로 파일 읽기
             file_path = self.data_dir / 'kr-Report_2018.txt'
             
@@ -128,29 +133,12 @@ class SangsungWordcloud:
             hangul_text = self.extract_hangul(self.read_file())
             
             # 한글 텍스트를 형태소 분석하여 명사만 추출
-            # nouns() 메서드를 사용하면 명사만 추출 가능
-            noun_tokens = []
-            
-            # 텍스트를 적절한 크기로 나누어 처리 (너무 긴 텍스트는 메모리 문제 발생 가능)
-            chunk_size = 1000  # 한 번에 처리할 문자 수
-            for i in range(0, len(hangul_text), chunk_size):
-                chunk = hangul_text[i:i+chunk_size]
-                if not chunk.strip():
-                    continue
-                    
-                try:
-                    # nouns() 메서드로 명사만 직접 추출 (더 정확함)
-                    nouns = self.okt.nouns(chunk)
-                    
-                    # 길이 1보다 큰 명사만 추가
-                    for noun in nouns:
-                        if len(noun) > 1:  # 길이 1보다 큰 명사만
-                            # 숫자로만 이루어진 단어 제외
-                            if not noun.isdigit():
-                                noun_tokens.append(noun)
-                except Exception as e:
-                    logger.warning(f"청크 처리 중 오류: {e}")
-                    continue
+            # 전체 텍스트를 한 번에 넘겨 JVM 호출을 문서당 1회로 줄임
+            # 길이 1보다 큰 명사만, 숫자로만 이루어진 단어 제외
+            noun_tokens = [
+                noun for noun in self.okt.nouns(hangul_text)
+                if len(noun) > 1 and not noun.isdigit()
+            ]
             
             if not noun_tokens:
                 raise ValueError("명사가 추출되지 않았습니다.")
@@ -215,7 +203,7 @@ class SangsungWordcloud:
                 raise ValueError("토큰이 없습니다.")
             
             # 불용어 로드
-            stopwords = self.read_stopword()
+            stopwords = set(self.read_stopword())
             
             # 불용어 제거
             filtered_texts = [text for text in tokens if text not in stopwords]
@@ -9,6 +9,8 @@ from typing import List, Dict, Optional
 from pydantic import BaseModel
 import base64
 import logging
+import traceback
+from pathlib import Path
 
 from app.seoul_crime.seoul_data import SeoulCrimeData
 from app.seoul_crime.seoul_method import SeoulCrimeMethod
@@ -103,7 +105,6 @@ async def preprocess():
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"전처리 중 오류 발생: {str(e)}")
 
@@ -332,7 +333,6 @@ async def search_police_station(station_name: str = None, name: str = None):
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"경찰서 검색 중 오류 발생: {str(e)}")
 
@@ -382,7 +382,6 @@ async def create_heatmap(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"히트맵 생성 중 오류 발생: {str(e)}")
 
@@ -413,7 +412,6 @@ async def get_heatmap_image(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"히트맵 이미지 생성 중 오류 발생: {str(e)}")
 
@@ -424,7 +422,6 @@ async def get_crime_rate_heatmap():
     범죄율 히트맵 이미지 파일 직접 반환 (PNG)
     """
     try:
-        from pathlib import Path
         save_dir = Path(__file__).parent / "save"
         image_path = save_dir / "crime_rate_heatmap.png"
         
@@ -450,7 +447,6 @@ async def get_crime_rate_heatmap():
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         logger.error(f"히트맵 이미지 로드 중 오류: {e}")
         raise HTTPException(status_code=500, detail=f"히트맵 이미지 로드 중 오류 발생: {str(e)}")
@@ -462,7 +458,6 @@ async def get_arrest_rate_heatmap():
     검거율 히트맵 이미지 파일 직접 반환 (PNG)
     """
     try:
-        from pathlib import Path
         save_dir = Path(__file__).parent / "save"
         image_path = save_dir / "arrest_rate_heatmap.png"
         
@@ -488,7 +483,6 @@ async def get_arrest_rate_heatmap():
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         logger.error(f"히트맵 이미지 로드 중 오류: {e}")
         raise HTTPException(status_code=500, detail=f"히트맵 이미지 로드 중 오류 발생: {str(e)}")
@@ -559,7 +553,6 @@ async def create_crime_map(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"지도 생성 중 오류 발생: {str(e)}")
 
@@ -621,7 +614,6 @@ async def get_crime_map_html(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         error_trace = traceback.format_exc()
         logger.error(f"지도 HTML 생성 중 예상치 못한 오류 발생: {e}\n{error_trace}")
         raise HTTPException(
@@ -650,7 +642,6 @@ async def get_crime_map_statistics():
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"통계 정보 조회 중 오류 발생: {str(e)}")
 
@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import HTMLResponse, JSONResponse
 from typing import Optional, Dict, Any
 from pathlib import Path
+import traceback
 
 from app.us_unemployment.service import USUnemploymentService
 
@@ -106,7 +107,6 @@ async def create_unemployment_map(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"지도 생성 중 오류 발생: {str(e)}")
 
@@ -146,7 +146,6 @@ async def get_map_html(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"지도 HTML 생성 중 오류 발생: {str(e)}")
 
@@ -171,7 +170,6 @@ async def get_statistics():
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"통계 정보 조회 중 오류 발생: {str(e)}")
 
@@ -203,7 +201,6 @@ async def get_unemployment_data():
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"데이터 조회 중 오류 발생: {str(e)}")
 
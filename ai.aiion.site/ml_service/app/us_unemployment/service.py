@@ -9,6 +9,7 @@ import folium
 from pathlib import Path
 from typing import Optional, Dict, Any
 import json
+from io import StringIO
 
 try:
     from common.utils import setup_logging
@@ -17,6 +18,10 @@ except ImportError:
     import logging
     logger = logging.getLogger("us_unemployment_service")
 
+# 예제 데이터 다운로드용 공유 세션 (GeoJSON/CSV가 같은 호스트이므로 keep-alive 연결 재사용)
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=8))
+
 
 class USUnemploymentService:
     """미국 실업률 데이터 시각화 서비스"""
@@ -39,7 +44,7 @@ class USUnemploymentService:
             GeoJSON 딕셔너리
         """
         try:
-            response = requests.get(self.STATE_GEO_URL, timeout=10)
+            response = HTTP_SESSION.get(self.STATE_GEO_URL, timeout=10)
             response.raise_for_status()
             self.state_geo = response.json()
             logger.info(f"주 경계 데이터 로드 완료: {len(self.state_geo.get('features', []))}개 주")
@@ -58,12 +63,10 @@ class USUnemploymentService:
         try:
             logger.info(f"실업률 데이터 로드 시도: {self.STATE_DATA_URL}")
             # pandas.read_csv는 timeout을 지원하지 않으므로 requests로 먼저 다운로드
-            import requests
-            response = requests.get(self.STATE_DATA_URL, timeout=10)
+            response = HTTP_SESSION.get(self.STATE_DATA_URL, timeout=10)
             response.raise_for_status()
             
             # StringIO를 사용하여 CSV 데이터를 DataFrame으로 변환
-            from io import StringIO
             self.state_data = pd.read_csv(StringIO(response.text))
             
             logger.info(f"실업률 데이터 로드 완료: {len(self.state_data)} 행")
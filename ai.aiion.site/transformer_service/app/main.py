@@ -4,6 +4,7 @@ FastAPI 애플리케이션 진입점
 """
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 
@@ -17,7 +18,8 @@ app = FastAPI(
     root_path=root_path,
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url=f"{root_path}/openapi.json" if root_path else "/openapi.json"
+    openapi_url=f"{root_path}/openapi.json" if root_path else "/openapi.json",
+    default_response_class=ORJSONResponse  # orjson으로 JSON 직렬화
 )
 
 # CORS 설정
@@ -3,6 +3,8 @@ Review Sentiment Model
 영화 리뷰 감성 분석 모델 클래스
 """
 
+import sys
+import functools
 import torch
 import torch.nn as nn
 from pathlib import Path
@@ -23,6 +25,31 @@ except ImportError:
     ic("경고: torch 또는 transformers가 설치되지 않았습니다.")
 
 
+@functools.lru_cache(maxsize=16)
+def _resolve_model_path(model_name: str) -> Path:
+    """KoELECTRA 모델 경로 찾기 (프로세스당 한 번만 파일시스템 탐색)"""
+    model_path_str = str(model_name)
+    
+    # 절대 경로가 아니면 찾기
+    if not Path(model_path_str).is_absolute():
+        # 1. Docker 환경: /app/koelectro_v3_base
+        docker_path = Path("/app/koelectro_v3_base")
+        if docker_path.exists() and (docker_path / "config.json").exists():
+            return docker_path
+        
+        # 2. 공통 모델 저장소: models/koelectra
+        # transformer_service/app이 루트
+        current_dir = Path(__file__).parent  # review
+        app_dir = current_dir.parent  # app
+        service_dir = app_dir.parent  # transformer_service
+        ai_dir = service_dir.parent  # ai.aiion.site
+        common_model_path = ai_dir / "models" / "koelectra"
+        if common_model_path.exists() and (common_model_path / "config.json").exists():
+            return common_model_path
+    
+    return Path(model_path_str)
+
+
 class ReviewSentimentClassifier(nn.Module):
     """KoELECTRA 기반 영화 리뷰 감성 분류 모델"""
     
@@ -31,7 +58,8 @@ class ReviewSentimentClassifier(nn.Module):
         model_name: str = "koelectro_v3_base",
         num_labels: int = 2,  # 긍정/부정 2-class
         dropout_rate: float = 0.3,
-        hidden_size: Optional[int] = None
+        hidden_size: Optional[int] = None,
+        use_checkpointing: bool = True
     ):
         """
         초기화
@@ -41,6 +69,8 @@ class ReviewSentimentClassifier(nn.Module):
             num_labels: 클래스 수 (2: 긍정/부정)
             dropout_rate: Dropout 비율
             hidden_size: 중간 hidden layer 크기
+            use_checkpointing: 인코더 gradient checkpointing 사용 여부
+                (역전파 시 활성값 재계산으로 메모리 절감, 더 큰 배치 사용 가능)
         """
         super().__init__()
         if not TORCH_AVAILABLE:
@@ -49,26 +79,35 @@ class ReviewSentimentClassifier(nn.Module):
         self.num_labels = num_labels
         
         # 모델 경로 찾기
-        model_path = self._find_model_path(model_name)
+        model_path = _resolve_model_path(model_name)
         
         if model_path.exists() and (model_path / "config.json").exists():
             # 로컬 모델 로드
             ic(f"✅ 로컬 모델 로드: {model_path}")
             self.config = AutoConfig.from_pretrained(str(model_path))
-            self.bert = AutoModel.from_pretrained(str(model_path))
+            self.bert = self._load_encoder(str(model_path))
         else:
             # HuggingFace 모델 로드
             ic(f"🌐 HuggingFace 모델 로드: {model_name}")
             self.config = AutoConfig.from_pretrained(model_name)
-            self.bert = AutoModel.from_pretrained(model_name)
+            self.bert = self._load_encoder(model_name)
+        
+        # [CLS] hidden state만 사용하므로 레이어별 hidden state/attention 출력은 만들지 않음
+        self.bert.config.output_hidden_states = False
+        self.bert.config.output_attentions = False
+        
+        if use_checkpointing:
+            # non-reentrant 체크포인팅: 입력이 requires_grad가 아니어도 동작하므로
+            # 동결된 임베딩/하위 레이어까지 역전파가 확장되지 않음
+            self.bert.gradient_checkpointing_enable(gradient_checkpointing_kwargs={"use_reentrant": False})
         
         self.dropout = nn.Dropout(dropout_rate)
         
-        # 분류 헤드
+        # 분류 헤드 (in-place ReLU: 중간 활성값 버퍼를 추가로 만들지 않고 Linear 출력에 바로 적용)
         if hidden_size:
             self.classifier = nn.Sequential(
                 nn.Linear(self.config.hidden_size, hidden_size),
-                nn.ReLU(),
+                nn.ReLU(inplace=True),
                 nn.Dropout(dropout_rate),
                 nn.Linear(hidden_size, num_labels)
             )
@@ -78,28 +117,20 @@ class ReviewSentimentClassifier(nn.Module):
         self.model_name = model_name
         ic(f"ReviewSentimentClassifier 초기화 완료: {num_labels}-class")
     
-    def _find_model_path(self, model_name: str) -> Path:
-        """KoELECTRA 모델 경로 찾기"""
-        model_path_str = str(model_name)
-        
-        # 절대 경로가 아니면 찾기
-        if not Path(model_path_str).is_absolute():
-            # 1. Docker 환경: /app/koelectro_v3_base
-            docker_path = Path("/app/koelectro_v3_base")
-            if docker_path.exists() and (docker_path / "config.json").exists():
-                return docker_path
-            
-            # 2. 공통 모델 저장소: models/koelectra
-            # transformer_service/app이 루트
-            current_dir = Path(__file__).parent  # review
-            app_dir = current_dir.parent  # app
-            service_dir = app_dir.parent  # transformer_service
-            ai_dir = service_dir.parent  # ai.aiion.site
-            common_model_path = ai_dir / "models" / "koelectra"
-            if common_model_path.exists() and (common_model_path / "config.json").exists():
-                return common_model_path
-        
-        return Path(model_path_str)
+    @staticmethod
+    def _load_encoder(name_or_path: str):
+        """
+        인코더 로드 (가능하면 SDPA attention 사용)
+        
+        SDPA는 softmax와 matmul을 fused 커널로 처리해 L×L attention 행렬을 메모리에 쓰지 않습니다.
+        설치된 transformers 버전이나 모델 아키텍처가 attn_implementation을 지원하지 않으면
+        기본(eager) attention으로 로드합니다.
+        """
+        try:
+            return AutoModel.from_pretrained(name_or_path, attn_implementation="sdpa")
+        except (TypeError, ValueError) as e:
+            ic(f"SDPA attention 미지원, 기본 attention 사용: {e}")
+            return AutoModel.from_pretrained(name_or_path)
     
     def forward(
         self,
@@ -124,8 +155,8 @@ class ReviewSentimentClassifier(nn.Module):
             token_type_ids=token_type_ids
         )
         
-        # [CLS] 토큰의 hidden state 추출
-        pooled_output = outputs.last_hidden_state[:, 0, :]
+        # [CLS] 토큰의 hidden state 추출 (select는 fancy indexing 없이 view로 슬라이스)
+        pooled_output = outputs.last_hidden_state.select(1, 0).contiguous()
         
         # Dropout 및 분류
         pooled_output = self.dropout(pooled_output)
@@ -178,55 +209,95 @@ class ReviewSentimentDLModel:
             self.device = device
         
         # 토크나이저 로드
-        model_path = self._find_model_path(model_name)
+        model_path = _resolve_model_path(model_name)
         if model_path.exists() and (model_path / "config.json").exists():
             ic(f"✅ 로컬 토크나이저 로드: {model_path}")
-            self.tokenizer = AutoTokenizer.from_pretrained(str(model_path))
+            self.tokenizer = AutoTokenizer.from_pretrained(str(model_path), use_fast=True)
         else:
             ic(f"🌐 HuggingFace 토크나이저 로드: {model_name}")
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
         
         # 모델 초기화
         self.model = None
         
         ic(f"ReviewSentimentDLModel 초기화 완료: device={self.device}")
     
-    def _find_model_path(self, model_name: str) -> Path:
-        """KoELECTRA 모델 경로 찾기"""
-        model_path_str = str(model_name)
-        
-        if not Path(model_path_str).is_absolute():
-            # 1. Docker 환경
-            docker_path = Path("/app/koelectro_v3_base")
-            if docker_path.exists() and (docker_path / "config.json").exists():
-                return docker_path
-            
-            # 2. 공통 모델 저장소
-            current_dir = Path(__file__).parent  # review
-            app_dir = current_dir.parent  # app
-            service_dir = app_dir.parent  # transformer_service
-            ai_dir = service_dir.parent  # ai.aiion.site
-            common_model_path = ai_dir / "models" / "koelectra"
-            if common_model_path.exists() and (common_model_path / "config.json").exists():
-                return common_model_path
-        
-        return Path(model_path_str)
-    
     def create_model(
         self,
         dropout_rate: float = 0.3,
-        hidden_size: Optional[int] = None
+        hidden_size: Optional[int] = None,
+        compile_model: bool = True,
+        use_checkpointing: bool = True
     ):
-        """모델 생성"""
+        """
+        모델 생성
+        
+        Args:
+            dropout_rate: Dropout 비율
+            hidden_size: 중간 hidden layer 크기
+            compile_model: CUDA 환경에서 torch.compile 적용 여부
+                (커널 퓨전으로 스텝 시간 단축, 첫 스텝은 컴파일 워밍업으로 느림)
+            use_checkpointing: 인코더 gradient checkpointing 사용 여부
+        """
         self.model = ReviewSentimentClassifier(
             model_name=self.model_name,
             num_labels=self.num_labels,
             dropout_rate=dropout_rate,
-            hidden_size=hidden_size
+            hidden_size=hidden_size,
+            use_checkpointing=use_checkpointing
         )
         self.model.to(self.device)
+        
+        # 학습 배치는 동적 패딩으로 시퀀스 길이가 바뀌므로 dynamic=True로 길이마다 재컴파일되지 않도록 함
+        # reduce-overhead(CUDA graphs)는 (batch, seq_len) shape마다 그래프/메모리 풀을 따로 잡으므로 default 모드 사용
+        # Windows는 Inductor(triton)를 지원하지 않으므로 eager 모드 유지
+        if compile_model and torch.cuda.is_available() and sys.platform != "win32":
+            self.model = torch.compile(self.model, mode="default", fullgraph=False, dynamic=True)
+            ic("torch.compile 적용 (첫 스텝에서 컴파일 워밍업)")
+        
         ic(f"모델 생성 완료: {self.model_name}")
     
+    @property
+    def base_model(self) -> Optional[nn.Module]:
+        """torch.compile 래퍼를 벗긴 원본 모델 (state_dict 저장/로드용)"""
+        return getattr(self.model, "_orig_mod", self.model)
+    
+    def quantize_for_inference(
+        self,
+        method: str = "dynamic",
+        save_path: Optional[Path] = None
+    ) -> nn.Module:
+        """
+        추론용 INT8 양자화 (CPU 배포용)
+        
+        nn.Linear 가중치를 int8로 동적 양자화합니다 (활성값은 실행 시 양자화).
+        양자화 모델은 CPU에서만 동작하므로 디바이스를 CPU로 전환합니다.
+        저장한 state_dict는 create_model() → quantize_for_inference() 후 load_state_dict()로 로드합니다.
+        
+        Args:
+            method: 양자화 방식 (현재 'dynamic'만 지원)
+            save_path: 양자화 모델 state_dict 저장 경로 (선택)
+            
+        Returns:
+            양자화된 모델
+        """
+        if self.model is None:
+            raise RuntimeError("모델이 생성되지 않았습니다. create_model()을 먼저 호출하세요.")
+        if method != "dynamic":
+            raise ValueError(f"지원하지 않는 양자화 방식: {method}")
+        
+        model = self.base_model.cpu().eval()
+        self.model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+        self.device = torch.device("cpu")
+        
+        if save_path is not None:
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+            torch.save(self.model.state_dict(), save_path)
+            ic(f"양자화 모델 저장: {save_path}")
+        
+        ic(f"INT8 동적 양자화 완료: {self.model_name}")
+        return self.model
+    
     def __repr__(self) -> str:
         """문자열 표현"""
         return f"ReviewSentimentDLModel(model_name={self.model_name}, device={self.device})"
@@ -7,11 +7,11 @@ import sys
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 import pandas as pd
-import numpy as np
 import pickle
 from datetime import datetime
 import torch
 import torch.nn.functional as F
+from safetensors.torch import load_file
 
 try:
     from icecream import ic
@@ -78,8 +78,9 @@ class ReviewSentimentService:
                 self.model_dir = local_model_dir
                 ic(f"✅ 중앙 저장소 디렉토리 생성: {self.model_dir}")
         
-        # 모델 파일
-        self.dl_model_file = self.model_dir / "review_sentiment_dl_model.pt"
+        # 모델 파일 (safetensors, 이전 버전의 torch.save 체크포인트도 로드 지원)
+        self.dl_model_file = self.model_dir / "review_sentiment_dl_model.safetensors"
+        self.legacy_dl_model_file = self.model_dir / "review_sentiment_dl_model.pt"
         self.dl_metadata_file = self.model_dir / "review_sentiment_dl_metadata.pkl"
         
         # DL 모델 및 트레이너
@@ -109,7 +110,8 @@ class ReviewSentimentService:
     
     def _try_load_model(self):
         """저장된 모델 로드 시도"""
-        if self.dl_model_file.exists() and self.dl_metadata_file.exists():
+        model_file = self.dl_model_file if self.dl_model_file.exists() else self.legacy_dl_model_file
+        if model_file.exists() and self.dl_metadata_file.exists():
             try:
                 # 메타데이터 로드
                 with open(self.dl_metadata_file, 'rb') as f:
@@ -122,12 +124,14 @@ class ReviewSentimentService:
                 )
                 
                 # 모델 가중치 로드
-                self.dl_model_obj.model.load_state_dict(
-                    torch.load(self.dl_model_file, map_location=self.dl_model_obj.device)
-                )
+                if model_file.suffix == '.safetensors':
+                    state_dict = load_file(str(model_file), device=str(self.dl_model_obj.device))
+                else:
+                    state_dict = torch.load(model_file, map_location=self.dl_model_obj.device)
+                self.dl_model_obj.base_model.load_state_dict(state_dict)
                 self.dl_model_obj.model.eval()
                 
-                ic(f"✅ 모델 로드 완료: {self.dl_model_file}")
+                ic(f"✅ 모델 로드 완료: {model_file}")
             except Exception as e:
                 ic(f"⚠️ 모델 로드 실패: {e}")
                 ic("새 모델을 생성합니다.")
@@ -3,24 +3,44 @@ Review Sentiment Trainer
 영화 리뷰 감성 분석 딥러닝 학습 트레이너
 """
 
+import os
+import json
+import logging
+import random
+import hashlib
+import threading
 from typing import Optional, Tuple, Dict, Any, List
 import pandas as pd
-import numpy as np
 from icecream import ic
 from pathlib import Path
 
 try:
     import torch
-    from torch.utils.data import Dataset, DataLoader
-    from torch import nn
+    from torch.utils.data import Dataset, DataLoader, Sampler
+    import torch.nn.functional as F
     from torch.optim import AdamW
+    import transformers
     from transformers import get_linear_schedule_with_warmup
+    from safetensors.torch import save_file
     from tqdm import tqdm
     TORCH_AVAILABLE = True
 except ImportError:
     TORCH_AVAILABLE = False
     ic("경고: torch 관련 라이브러리가 설치되지 않았습니다.")
 
+# 8-bit AdamW (선택 의존성, CUDA 전용) - 없으면 torch AdamW 사용
+try:
+    from bitsandbytes.optim import AdamW8bit
+    BNB_AVAILABLE = True
+except ImportError:
+    BNB_AVAILABLE = False
+
+# 학습 루프 로그는 logging 사용 (ic는 호출 프레임을 inspect하므로 반복 경로에서 비용이 큼)
+logger = logging.getLogger("review_trainer")
+
+# 토크나이징 결과 디스크 캐시 디렉토리 (반복 학습 시 재토크나이징 생략)
+TOKENIZE_CACHE_DIR = Path(os.getenv("AIION_CACHE_DIR", str(Path.home() / ".cache" / "aiion")))
+
 
 class ReviewDataset(Dataset):
     """리뷰 감성 분석 데이터셋 (PyTorch)"""
@@ -39,38 +59,171 @@ class ReviewDataset(Dataset):
             texts: 리뷰 텍스트 리스트
             labels: 라벨 리스트 (0: 부정, 1: 긍정)
             tokenizer: HuggingFace 토크나이저
-            max_length: 최대 토큰 길이
+            max_length: 최대 토큰 길이 (truncation 상한, 패딩은 collate 단계에서 배치 최장 길이로)
         """
-        self.texts = texts
-        self.labels = labels
-        self.tokenizer = tokenizer
         self.max_length = max_length
-    
-    def __len__(self):
-        return len(self.texts)
-    
-    def __getitem__(self, idx):
-        text = str(self.texts[idx])
-        label = self.labels[idx]
+        # 라벨은 0/1뿐이므로 uint8로 보관 (H2D 전송량 축소, 디바이스에서 long으로 변환)
+        self.labels = torch.as_tensor([int(label) for label in labels], dtype=torch.uint8)
         
-        # 토크나이징
-        encoding = self.tokenizer(
-            text,
+        # 샘플별 토큰 ID를 하나의 1차원 텐서로 이어 붙이고 offsets로 구간을 구분
+        # (패딩하지 않은 ID를 보관하고 ReviewCollator가 배치 단위로 패딩)
+        texts = [str(text) for text in texts]
+        cache_file = self._cache_file(texts, tokenizer, max_length)
+        cached = self._load_cache(cache_file)
+        if cached is not None:
+            self.flat_ids, self.offsets = cached
+            ic(f"토크나이징 캐시 사용: {cache_file}")
+        else:
+            self.flat_ids, self.offsets = self._tokenize(texts, tokenizer, max_length)
+            self._save_cache(cache_file, tokenizer, max_length)
+    
+    @staticmethod
+    def _tokenize(texts: List[str], tokenizer, max_length: int) -> Tuple[torch.Tensor, torch.Tensor]:
+        """전체 텍스트를 한 번에 배치 토크나이징 (에포크마다 반복되는 샘플 단위 토크나이징 제거)"""
+        encoding = tokenizer(
+            texts,
             add_special_tokens=True,
-            max_length=self.max_length,
-            padding='max_length',
+            max_length=max_length,
+            padding=False,
             truncation=True,
-            return_attention_mask=True,
-            return_tensors='pt'
+            return_attention_mask=False
         )
-        
+        input_ids = encoding['input_ids']
+        lengths = torch.tensor([0] + [len(ids) for ids in input_ids], dtype=torch.long)
+        flat_ids = torch.tensor([i for ids in input_ids for i in ids], dtype=torch.long)
+        return flat_ids, torch.cumsum(lengths, dim=0)
+    
+    @staticmethod
+    def _cache_file(texts: List[str], tokenizer, max_length: int) -> Path:
+        """토크나이저/최대 길이/텍스트 내용 기준 캐시 파일 경로"""
+        digest = hashlib.sha256()
+        digest.update(f"{tokenizer.name_or_path}|{len(tokenizer)}|{max_length}|{transformers.__version__}".encode('utf-8'))
+        for text in texts:
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\0')
+        return TOKENIZE_CACHE_DIR / f"review_tok_{digest.hexdigest()[:16]}.pt"
+    
+    @staticmethod
+    def _load_cache(cache_file: Path) -> Optional[Tuple[torch.Tensor, torch.Tensor]]:
+        """캐시 로드 (mmap으로 필요한 페이지만 읽음), 없거나 손상되었으면 None"""
+        if not cache_file.exists():
+            return None
+        try:
+            cached = torch.load(cache_file, mmap=True, weights_only=True)
+            return cached['flat_ids'], cached['offsets']
+        except Exception as e:
+            ic(f"토크나이징 캐시 로드 실패, 다시 토크나이징: {e}")
+            return None
+    
+    def _save_cache(self, cache_file: Path, tokenizer, max_length: int):
+        """토크나이징 결과 및 메타데이터 사이드카(json) 저장, 실패해도 학습은 계속 진행"""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            torch.save({'flat_ids': self.flat_ids, 'offsets': self.offsets}, cache_file)
+            meta = {
+                'tokenizer': tokenizer.name_or_path,
+                'vocab_size': len(tokenizer),
+                'max_length': max_length,
+                'transformers_version': transformers.__version__,
+                'num_samples': len(self.labels)
+            }
+            cache_file.with_suffix('.json').write_text(json.dumps(meta, ensure_ascii=False), encoding='utf-8')
+        except OSError as e:
+            ic(f"토크나이징 캐시 저장 실패: {e}")
+    
+    def __len__(self):
+        return len(self.labels)
+    
+    @property
+    def lengths(self) -> List[int]:
+        """샘플별 토큰 길이 (LengthBucketSampler용)"""
+        return (self.offsets[1:] - self.offsets[:-1]).tolist()
+    
+    def __getitem__(self, idx):
+        input_ids = self.flat_ids[self.offsets[idx]:self.offsets[idx + 1]].tolist()
+        return {
+            'input_ids': input_ids,
+            'attention_mask': [1] * len(input_ids),
+            'labels': self.labels[idx]
+        }
+
+
+class ReviewCollator:
+    """
+    배치 collate 함수
+    
+    배치 내 최장 시퀀스 길이까지만 패딩하고(tokenizer.pad),
+    attention_mask/labels는 uint8로 만들어 H2D 전송 바이트를 줄입니다.
+    DataLoader 워커 프로세스로 전달될 수 있도록 모듈 레벨 클래스로 정의합니다.
+    """
+    
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+    
+    def __call__(self, features: List[Dict[str, Any]]) -> Dict[str, torch.Tensor]:
+        labels = torch.stack([feature.pop('labels') for feature in features])
+        batch = self.tokenizer.pad(features, padding='longest', return_tensors='pt')
         return {
-            'input_ids': encoding['input_ids'].flatten(),
-            'attention_mask': encoding['attention_mask'].flatten(),
-            'labels': torch.tensor(label, dtype=torch.long)
+            'input_ids': batch['input_ids'],
+            'attention_mask': batch['attention_mask'].to(torch.uint8),
+            'labels': labels
         }
 
 
+class LengthBucketSampler(Sampler):
+    """
+    길이 버킷 배치 샘플러
+    
+    인덱스를 섞은 뒤 batch_size * bucket_size_multiplier 크기의 묶음(mega-batch)으로 나누고,
+    묶음 안에서 토큰 길이순으로 정렬해 배치를 만듭니다. 비슷한 길이끼리 배치되므로
+    동적 패딩 시 배치 최장 길이가 짧아집니다. 배치 순서는 다시 섞어 학습 순서의 편향을 줄입니다.
+    shuffle=False이면 전체를 길이순으로 정렬해 배치합니다 (검증용).
+    """
+    
+    def __init__(
+        self,
+        lengths: List[int],
+        batch_size: int,
+        shuffle: bool = True,
+        bucket_size_multiplier: int = 100
+    ):
+        """
+        초기화
+        
+        Args:
+            lengths: 샘플별 토큰 길이
+            batch_size: 배치 크기
+            shuffle: 섞기 여부
+            bucket_size_multiplier: mega-batch 크기 배수
+        """
+        self.lengths = lengths
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.bucket_size = batch_size * bucket_size_multiplier if shuffle else max(len(lengths), 1)
+    
+    def __iter__(self):
+        indices = list(range(len(self.lengths)))
+        if self.shuffle:
+            random.shuffle(indices)
+        
+        batches = []
+        for start in range(0, len(indices), self.bucket_size):
+            bucket = sorted(indices[start:start + self.bucket_size], key=self.lengths.__getitem__)
+            batches.extend(
+                bucket[i:i + self.batch_size] for i in range(0, len(bucket), self.batch_size)
+            )
+        
+        if self.shuffle:
+            random.shuffle(batches)
+        return iter(batches)
+    
+    def __len__(self):
+        n = len(self.lengths)
+        full_buckets, remainder = divmod(n, self.bucket_size)
+        per_bucket = -(-self.bucket_size // self.batch_size)
+        return full_buckets * per_bucket + -(-remainder // self.batch_size)
+
+
 class ReviewSentimentTrainer:
     """영화 리뷰 감성 분석 딥러닝 트레이너"""
     
@@ -100,7 +253,56 @@ class ReviewSentimentTrainer:
             self.device = device
         
         self.model.to(self.device)
-        ic(f"트레이너 초기화 완료: device={self.device}")
+        
+        # 혼합 정밀도 autocast dtype (None이면 FP32)
+        self.amp_dtype: Optional[torch.dtype] = None
+        
+        # 백그라운드 체크포인트 저장 스레드 및 저장 중 발생한 예외
+        self._save_thread: Optional[threading.Thread] = None
+        self._save_error: Optional[BaseException] = None
+        logger.info("트레이너 초기화 완료: device=%s", self.device)
+    
+    def _resolve_amp_dtype(self, precision: str) -> Optional[torch.dtype]:
+        """
+        학습 정밀도 문자열을 autocast dtype으로 변환
+        
+        CUDA가 아니거나 'fp32'이면 None (FP32 유지),
+        'bf16'을 요청했지만 GPU가 지원하지 않으면 fp16으로 대체합니다.
+        """
+        if self.device.type != 'cuda' or precision == 'fp32':
+            return None
+        if precision == 'bf16' and torch.cuda.is_bf16_supported():
+            return torch.bfloat16
+        return torch.float16
+    
+    def _loader_kwargs(self, num_workers: Optional[int]) -> Dict[str, Any]:
+        """
+        DataLoader 공통 옵션
+        
+        워커 프로세스로 배치 수집을 메인 루프와 겹치고,
+        CUDA에서는 pinned memory를 사용해 non_blocking H2D 복사가 가능하도록 합니다.
+        """
+        if num_workers is None:
+            num_workers = (os.cpu_count() or 2) // 2
+        kwargs: Dict[str, Any] = {
+            # 배치 내 최장 시퀀스 길이까지만 패딩 (max_length 고정 패딩 대비 attention 연산량 감소)
+            'collate_fn': ReviewCollator(self.tokenizer),
+            'num_workers': num_workers,
+            'pin_memory': self.device.type == 'cuda'
+        }
+        # persistent_workers/prefetch_factor는 워커가 있을 때만 허용됨
+        if num_workers > 0:
+            kwargs['persistent_workers'] = True
+            kwargs['prefetch_factor'] = 4
+        return kwargs
+    
+    def _autocast(self):
+        """순전파/손실 계산용 autocast 컨텍스트"""
+        return torch.autocast(
+            device_type=self.device.type,
+            dtype=self.amp_dtype or torch.bfloat16,
+            enabled=self.amp_dtype is not None
+        )
     
     def train(
         self,
@@ -112,7 +314,12 @@ class ReviewSentimentTrainer:
         max_length: int = 512,
         num_layers_to_freeze: int = 8,
         early_stopping_patience: int = 3,
-        save_path: Optional[Path] = None
+        save_path: Optional[Path] = None,
+        precision: str = "bf16",
+        num_workers: Optional[int] = None,
+        gradient_accumulation_steps: int = 1,
+        use_8bit_optim: bool = True,
+        log_interval: int = 50
     ) -> Dict[str, Any]:
         """
         모델 학습
@@ -127,6 +334,13 @@ class ReviewSentimentTrainer:
             num_layers_to_freeze: 동결할 레이어 수
             early_stopping_patience: Early stopping patience
             save_path: 모델 저장 경로
+            precision: 학습 정밀도 ('bf16', 'fp16', 'fp32' / CUDA에서만 적용)
+            num_workers: DataLoader 워커 수 (None이면 CPU 코어 수의 절반)
+            gradient_accumulation_steps: 그래디언트 누적 스텝 수
+                (유효 배치 크기 = batch_size * gradient_accumulation_steps)
+            use_8bit_optim: bitsandbytes 설치 + CUDA 환경이면 8-bit AdamW 사용
+                (옵티마이저 상태를 int8로 양자화하여 메모리 약 1/4)
+            log_interval: 진행 표시줄 손실 갱신 간격 (스텝)
             
         Returns:
             학습 결과 딕셔너리
@@ -142,11 +356,12 @@ class ReviewSentimentTrainer:
             max_length=max_length
         )
         
+        loader_kwargs = self._loader_kwargs(num_workers)
+        # 길이가 비슷한 샘플끼리 배치하여 동적 패딩 길이 최소화
         train_loader = DataLoader(
             train_dataset,
-            batch_size=batch_size,
-            shuffle=True,
-            num_workers=0
+            batch_sampler=LengthBucketSampler(train_dataset.lengths, batch_size, shuffle=True),
+            **loader_kwargs
         )
         
         val_loader = None
@@ -159,22 +374,31 @@ class ReviewSentimentTrainer:
             )
             val_loader = DataLoader(
                 val_dataset,
-                batch_size=batch_size,
-                shuffle=False,
-                num_workers=0
+                batch_sampler=LengthBucketSampler(val_dataset.lengths, batch_size, shuffle=False),
+                **loader_kwargs
             )
         
         # 옵티마이저 및 스케줄러
-        optimizer = AdamW(self.model.parameters(), lr=learning_rate)
-        total_steps = len(train_loader) * epochs
+        # 동결된 파라미터는 제외하여 AdamW 모멘트(m, v) 상태를 할당하지 않음
+        trainable_params = [p for p in self.model.parameters() if p.requires_grad]
+        if use_8bit_optim and BNB_AVAILABLE and self.device.type == 'cuda':
+            optimizer = AdamW8bit(trainable_params, lr=learning_rate)
+            logger.info("옵티마이저: bitsandbytes AdamW8bit")
+        else:
+            optimizer = AdamW(trainable_params, lr=learning_rate)
+        # 스케줄러는 옵티마이저 스텝 단위 (에포크 마지막의 남은 micro-batch도 한 스텝으로 처리)
+        steps_per_epoch = -(-len(train_loader) // gradient_accumulation_steps)
+        total_steps = steps_per_epoch * epochs
         scheduler = get_linear_schedule_with_warmup(
             optimizer,
             num_warmup_steps=0,
             num_training_steps=total_steps
         )
         
-        # 손실 함수
-        criterion = nn.CrossEntropyLoss()
+        # 혼합 정밀도 (fp16일 때만 GradScaler로 손실 스케일링, bf16/fp32는 비활성화 상태로 통과)
+        self.amp_dtype = self._resolve_amp_dtype(precision)
+        scaler = torch.cuda.amp.GradScaler(enabled=self.amp_dtype == torch.float16)
+        logger.info("학습 정밀도: %s", self.amp_dtype or torch.float32)
         
         # 학습
         best_val_loss = float('inf')
@@ -184,44 +408,52 @@ class ReviewSentimentTrainer:
         val_accuracies = []
         
         for epoch in range(epochs):
-            ic(f"\n에포크 {epoch + 1}/{epochs}")
+            logger.info("에포크 %d/%d", epoch + 1, epochs)
             
             # 학습 모드
             self.model.train()
-            train_loss = 0.0
+            # 손실은 디바이스 텐서로 누적 (매 스텝 .item() 호출 시 GPU 동기화가 발생하므로 log_interval마다만 조회)
+            train_loss = torch.zeros((), device=self.device)
             
+            optimizer.zero_grad(set_to_none=True)
             progress_bar = tqdm(train_loader, desc=f"Epoch {epoch + 1}")
-            for batch in progress_bar:
-                input_ids = batch['input_ids'].to(self.device)
-                attention_mask = batch['attention_mask'].to(self.device)
-                labels = batch['labels'].to(self.device)
+            for step, batch in enumerate(progress_bar):
+                input_ids = batch['input_ids'].to(self.device, non_blocking=True)
+                attention_mask = batch['attention_mask'].to(self.device, non_blocking=True)
+                labels = batch['labels'].to(self.device, non_blocking=True).long()
                 
-                optimizer.zero_grad()
+                with self._autocast():
+                    outputs = self.model(
+                        input_ids=input_ids,
+                        attention_mask=attention_mask
+                    )
+                    loss = F.cross_entropy(outputs, labels)
                 
-                outputs = self.model(
-                    input_ids=input_ids,
-                    attention_mask=attention_mask
-                )
+                # 누적 스텝 수로 나눠 유효 배치 기준 평균 손실의 그래디언트가 되도록 함
+                scaler.scale(loss / gradient_accumulation_steps).backward()
                 
-                loss = criterion(outputs, labels)
-                loss.backward()
-                optimizer.step()
-                scheduler.step()
+                if (step + 1) % gradient_accumulation_steps == 0 or step + 1 == len(train_loader):
+                    scaler.step(optimizer)
+                    scaler.update()
+                    scheduler.step()
+                    # set_to_none: 파라미터별 memset 커널 없이 .grad 해제
+                    optimizer.zero_grad(set_to_none=True)
                 
-                train_loss += loss.item()
-                progress_bar.set_postfix({'loss': loss.item()})
+                train_loss += loss.detach().float()
+                if (step + 1) % log_interval == 0:
+                    progress_bar.set_postfix({'loss': (train_loss / (step + 1)).item()})
             
-            avg_train_loss = train_loss / len(train_loader)
+            avg_train_loss = (train_loss / len(train_loader)).item()
             train_losses.append(avg_train_loss)
-            ic(f"학습 손실: {avg_train_loss:.4f}")
+            logger.info("학습 손실: %.4f", avg_train_loss)
             
             # 검증
             if val_loader is not None:
-                val_loss, val_accuracy = self._validate(val_loader, criterion)
+                val_loss, val_accuracy = self._validate(val_loader)
                 val_losses.append(val_loss)
                 val_accuracies.append(val_accuracy)
                 
-                ic(f"검증 손실: {val_loss:.4f}, 정확도: {val_accuracy:.4f}")
+                logger.info("검증 손실: %.4f, 정확도: %.4f", val_loss, val_accuracy)
                 
                 # Early stopping
                 if val_loss < best_val_loss:
@@ -231,13 +463,16 @@ class ReviewSentimentTrainer:
                     # 모델 저장
                     if save_path:
                         self._save_model(save_path)
-                        ic(f"모델 저장: {save_path}")
+                        logger.info("모델 저장: %s", save_path)
                 else:
                     patience_counter += 1
                     if patience_counter >= early_stopping_patience:
-                        ic(f"Early stopping (patience: {early_stopping_patience})")
+                        logger.info("Early stopping (patience: %d)", early_stopping_patience)
                         break
         
+        # 마지막 체크포인트 쓰기가 끝난 뒤 반환 (호출 측에서 바로 로드/메타데이터 저장 가능)
+        self.wait_for_save()
+        
         return {
             'train_losses': train_losses,
             'val_losses': val_losses,
@@ -246,39 +481,74 @@ class ReviewSentimentTrainer:
             'epochs_trained': epoch + 1
         }
     
-    def _validate(self, val_loader, criterion) -> Tuple[float, float]:
+    def _validate(self, val_loader) -> Tuple[float, float]:
         """검증"""
         self.model.eval()
-        val_loss = 0.0
-        correct = 0
+        # 디바이스 텐서로 누적하고 에포크 끝에서 한 번만 CPU로 가져옴 (배치마다 .item() 동기화 제거)
+        val_loss = torch.zeros((), device=self.device)
+        correct = torch.zeros((), device=self.device)
         total = 0
         
         with torch.no_grad():
             for batch in val_loader:
-                input_ids = batch['input_ids'].to(self.device)
-                attention_mask = batch['attention_mask'].to(self.device)
-                labels = batch['labels'].to(self.device)
-                
-                outputs = self.model(
-                    input_ids=input_ids,
-                    attention_mask=attention_mask
-                )
+                input_ids = batch['input_ids'].to(self.device, non_blocking=True)
+                attention_mask = batch['attention_mask'].to(self.device, non_blocking=True)
+                labels = batch['labels'].to(self.device, non_blocking=True).long()
                 
-                loss = criterion(outputs, labels)
-                val_loss += loss.item()
+                with self._autocast():
+                    outputs = self.model(
+                        input_ids=input_ids,
+                        attention_mask=attention_mask
+                    )
+                    loss = F.cross_entropy(outputs, labels)
+                val_loss += loss.detach().float() * labels.size(0)
                 
-                _, predicted = torch.max(outputs.data, 1)
+                predicted = outputs.argmax(dim=1)
                 total += labels.size(0)
-                correct += (predicted == labels).sum().item()
+                correct += (predicted == labels).sum()
         
-        avg_val_loss = val_loss / len(val_loader)
-        accuracy = correct / total
+        # 배치 크기가 일정하지 않으므로(길이 버킷) 샘플 수 기준 평균
+        avg_val_loss = (val_loss / total).item()
+        accuracy = (correct / total).item()
         
         return avg_val_loss, accuracy
     
     def _save_model(self, save_path: Path):
-        """모델 저장"""
+        """
+        모델 저장 (safetensors, 백그라운드 스레드)
+        
+        state_dict를 CPU로 한 번 복사해 스냅샷을 만든 뒤 디스크 쓰기는 별도 스레드에서 수행하여
+        다음 에포크 학습과 겹치게 합니다. 이전 저장이 끝나지 않았으면 먼저 기다립니다.
+        """
+        self.wait_for_save()
         save_path.parent.mkdir(parents=True, exist_ok=True)
-        torch.save(self.model.state_dict(), save_path)
-        ic(f"모델 저장 완료: {save_path}")
-
+        # torch.compile 적용 시 state_dict 키에 '_orig_mod.' 접두사가 붙지 않도록 원본 모듈 기준으로 저장
+        model = getattr(self.model, '_orig_mod', self.model)
+        # CPU 학습에서는 .cpu()가 같은 텐서를 반환하므로 copy=True로 항상 별도 스냅샷을 만듦
+        # (다음 optimizer.step()이 저장 중인 가중치를 바꾸지 않도록)
+        state_dict = {k: v.detach().to('cpu', copy=True).contiguous() for k, v in model.state_dict().items()}
+        self._save_thread = threading.Thread(
+            target=self._write_checkpoint,
+            args=(state_dict, save_path),
+            name='review-ckpt-save',
+            daemon=True
+        )
+        self._save_thread.start()
+    
+    def _write_checkpoint(self, state_dict: Dict[str, Any], save_path: Path):
+        """safetensors 파일 쓰기 (저장 스레드에서 실행, 예외는 wait_for_save()에서 다시 발생)"""
+        try:
+            save_file(state_dict, str(save_path))
+            logger.info("모델 저장 완료: %s", save_path)
+        except BaseException as e:
+            logger.exception("모델 저장 실패: %s", save_path)
+            self._save_error = e
+    
+    def wait_for_save(self):
+        """진행 중인 백그라운드 저장이 끝날 때까지 대기하고, 저장 실패 시 예외 발생"""
+        if self._save_thread is not None:
+            self._save_thread.join()
+            self._save_thread = None
+        if self._save_error is not None:
+            error, self._save_error = self._save_error, None
+            raise RuntimeError("모델 체크포인트 저장 실패") from error
@@ -11,12 +11,14 @@
 """
 
 import sys
+import logging
 from pathlib import Path
 
 # transformer_service/app 디렉토리를 Python 경로에 추가
 app_dir = Path(__file__).parent.parent  # app/
 sys.path.insert(0, str(app_dir))
 
+import torch
 from app.review.review_service import ReviewSentimentService
 from icecream import ic
 
@@ -24,6 +26,12 @@ from icecream import ic
 def main():
     """로컬에서 GPU로 모델 학습"""
     
+    # 트레이너 진행 로그(review_trainer 로거) 출력
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    
+    # FP32로 남는 matmul(autocast 밖 연산)에 TF32 텐서 코어 사용 허용 (Ampere 이상)
+    torch.set_float32_matmul_precision('high')
+    
     # 데이터 디렉토리 경로 설정
     data_dir = Path(__file__).parent / "data"
     